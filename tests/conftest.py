@@ -5,17 +5,24 @@ that need the same integration setup can reuse them without
 duplicating boilerplate (DRY).
 """
 
+import asyncio
 import sys
 import os
-from unittest.mock import AsyncMock
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, NamedTuple
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceRegistry, callback
 from homeassistant.helpers import entity_registry as er
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+import custom_components.ev_lb.coordinator  # noqa: F401 — preload PN_CREATE/PN_DISMISS targets
 from custom_components.ev_lb.const import (
     CONF_ACTION_SET_CURRENT,
     CONF_ACTION_START_CHARGING,
@@ -32,7 +39,11 @@ from custom_components.ev_lb.const import (
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-# Patch paths for persistent-notification helpers used across multiple test modules
+# Patch paths for persistent-notification helpers used across multiple test modules.
+# They target the names bound inside the coordinator module (patching the HA
+# persistent_notification module would not intercept them).  The coordinator is
+# imported above at collection time, so each patch() only rebinds an attribute on
+# an already-loaded module instead of paying the import chain inside a test.
 PN_CREATE = "custom_components.ev_lb.coordinator.pn_async_create"
 PN_DISMISS = "custom_components.ev_lb.coordinator.pn_async_dismiss"
 
@@ -45,6 +56,10 @@ SET_CURRENT_SCRIPT = "script.ev_lb_set_current"
 STOP_CHARGING_SCRIPT = "script.ev_lb_stop_charging"
 START_CHARGING_SCRIPT = "script.ev_lb_start_charging"
 
+# Standard Phase 1 baseline: 3000 W at 230 V leaves 18.96 A → charger at 18 A.
+PRIMED_METER_W = "3000"
+PRIMED_CURRENT_A = 18.0
+
 _BASE_CONFIG = {
     CONF_POWER_METER_ENTITY: POWER_METER,
     CONF_VOLTAGE: 230.0,
@@ -121,6 +136,46 @@ def mock_config_entry_ignore() -> MockConfigEntry:
     )
 
 
+@pytest.fixture
+def service_call_mock(monkeypatch: pytest.MonkeyPatch) -> Iterator[AsyncMock]:
+    """Route every ``hass.services.async_call`` through an :class:`AsyncMock`.
+
+    Calls pass through to the real service registry until a test sets
+    ``service_call_mock.side_effect`` (e.g. to a ``HomeAssistantError``) to
+    make them fail; setting it back to ``None`` restores normal calls.
+    """
+    mock = AsyncMock()
+    real_async_call = ServiceRegistry.async_call
+
+    async def _async_call(self: ServiceRegistry, *args: Any, **kwargs: Any) -> Any:
+        try:
+            await mock(*args, **kwargs)
+        except Exception as err:
+            # Tests may reuse one exception instance as side_effect; start each
+            # raise from a clean traceback so frames do not pile up on it.
+            raise err.with_traceback(None)
+        return await real_async_call(self, *args, **kwargs)
+
+    monkeypatch.setattr(ServiceRegistry, "async_call", _async_call)
+    yield mock
+    mock.side_effect = None
+
+
+@pytest.fixture
+def notification_mocks(monkeypatch: pytest.MonkeyPatch) -> tuple[MagicMock, MagicMock]:
+    """Replace the coordinator's persistent-notification calls for the whole test.
+
+    Returns the ``(create, dismiss)`` mocks installed at ``PN_CREATE`` and
+    ``PN_DISMISS``.  Use ``patch(PN_CREATE)`` instead when only one phase of
+    a test should be patched.
+    """
+    create = MagicMock()
+    dismiss = MagicMock()
+    monkeypatch.setattr(PN_CREATE, create)
+    monkeypatch.setattr(PN_DISMISS, dismiss)
+    return create, dismiss
+
+
 # -----------------------------------------------------------------------
 # Shared helpers
 # -----------------------------------------------------------------------
@@ -140,6 +195,18 @@ async def setup_integration(hass: HomeAssistant, entry: MockConfigEntry) -> None
     assert entry.state is ConfigEntryState.LOADED
 
 
+async def apply_states(hass: HomeAssistant, states: list[tuple[str, str]]) -> None:
+    """Set each ``(entity_id, state)`` pair in order, then wait for HA to settle once.
+
+    State-change listeners still see every intermediate value; only the
+    event-loop drain between them is skipped.  Use separate calls when a
+    test needs to assert on an intermediate state.
+    """
+    for entity_id, state in states:
+        hass.states.async_set(entity_id, state)
+    await hass.async_block_till_done()
+
+
 def get_entity_id(
     hass: HomeAssistant, entry: MockConfigEntry, platform: str, suffix: str
 ) -> str:
@@ -152,6 +219,74 @@ def get_entity_id(
     return entity_id
 
 
+class EntityIds(NamedTuple):
+    """Entity ids of the integration's commonly asserted entities for one config entry."""
+
+    current_set: str
+    available_current: str
+    balancer_state: str
+    reason: str
+    action_status: str
+    action_error: str
+    retry_count: str
+    action_latency: str
+    active: str
+    meter_status: str
+    fallback_active: str
+    ev_charging: str
+    max_charger_current: str
+    min_ev_current: str
+    enabled: str
+
+
+# Unique-id suffix for each EntityIds field, in field order.
+_ENTITY_ID_SUFFIXES = (
+    "current_set",
+    "available_current",
+    "balancer_state",
+    "last_action_reason",
+    "last_action_status",
+    "last_action_error",
+    "retry_count",
+    "action_latency",
+    "active",
+    "meter_status",
+    "fallback_active",
+    "ev_charging",
+    "max_charger_current",
+    "min_ev_current",
+    "enabled",
+)
+
+
+def get_entity_ids(hass: HomeAssistant, entry: MockConfigEntry) -> EntityIds:
+    """Resolve all :class:`EntityIds` for *entry* in a single entity-registry pass.
+
+    Prefer this over several :func:`get_entity_id` calls when a test needs
+    more than one or two entities.
+    """
+    ent_reg = er.async_get(hass)
+    by_unique_id = {
+        reg_entry.unique_id: reg_entry.entity_id
+        for reg_entry in er.async_entries_for_config_entry(ent_reg, entry.entry_id)
+    }
+    return EntityIds(
+        *(by_unique_id[f"{entry.entry_id}_{suffix}"] for suffix in _ENTITY_ID_SUFFIXES)
+    )
+
+
+def state_float(hass: HomeAssistant, entity_id: str) -> float:
+    """Return the numeric state of *entity_id* (e.g. a current sensor) as a float."""
+    return float(hass.states.get(entity_id).state)
+
+
+def assert_states(hass: HomeAssistant, expected: dict[str, str]) -> None:
+    """Assert each entity in *expected* has the given raw state string, naming any mismatch."""
+    for entity_id, state in expected.items():
+        actual = hass.states.get(entity_id).state
+        assert actual == state, f"{entity_id} is {actual!r}, expected {state!r}"
+
+
 def meter_w(non_ev_a: float, ev_a: float, voltage: float = 230.0) -> str:
     """Return the total meter reading in Watts for given non-EV and EV loads.
 
@@ -185,27 +320,213 @@ def meter_for_available(
     return str(round(service_current_a * voltage, 2))
 
 
-def collect_events(hass: HomeAssistant, event_type: str) -> list[dict]:
-    """Subscribe to an HA event type and return a list of captured event data dicts.
+def collect_events(hass: HomeAssistant, event_type: str) -> list[Mapping[str, Any]]:
+    """Subscribe to an HA event type and return a list of captured event data mappings.
 
     The returned list is populated in-place as events fire, so tests can
-    assert on it after triggering the relevant state changes.
+    assert on it after triggering the relevant state changes.  The listener
+    is a ``@callback``, so events fired from the coordinator's meter listener
+    are captured before ``hass.states.async_set`` returns.  ``event.data`` is
+    stored as-is: the coordinator builds a fresh payload for every event and
+    never touches it again, so no copy is needed.
     """
-    captured: list[dict] = []
+    captured: list[Mapping[str, Any]] = []
 
-    def _listener(event):
-        captured.append(dict(event.data))
+    @callback
+    def _listener(event) -> None:
+        captured.append(event.data)
 
     hass.bus.async_listen(event_type, _listener)
     return captured
 
 
+def count_events(hass: HomeAssistant, event_type: str) -> Callable[[], int]:
+    """Subscribe to an HA event type and return a callable giving the number fired so far.
+
+    Use instead of :func:`collect_events` when a test only checks how many
+    events fired, not their payloads.
+    """
+    fired = 0
+
+    @callback
+    def _listener(_event) -> None:
+        nonlocal fired
+        fired += 1
+
+    hass.bus.async_listen(event_type, _listener)
+    return lambda: fired
+
+
+class ScriptCallRecorder:
+    """Count charger action-script calls without storing every ServiceCall.
+
+    A lightweight stand-in for ``async_mock_service(hass, "script", "turn_on")``
+    for assertions that only need call counts and the last payload.  Keeps a
+    total count, a per-script ``{"count", "last"}`` bucket (``last`` is the
+    ``variables`` dict of the most recent call), and the entity_id of the most
+    recent call so ordering such as start → set_current can still be checked.
+    """
+
+    def __init__(self) -> None:
+        """Start with no recorded calls."""
+        self.count = 0
+        self.last_entity_id: str | None = None
+        self.by_script: defaultdict[str, dict[str, Any]] = defaultdict(
+            lambda: {"count": 0, "last": None}
+        )
+
+    @callback
+    def handle(self, call: ServiceCall) -> None:
+        """Record one ``script.turn_on`` call."""
+        entity_id = call.data["entity_id"]
+        self.count += 1
+        self.last_entity_id = entity_id
+        bucket = self.by_script[entity_id]
+        bucket["count"] += 1
+        bucket["last"] = call.data.get("variables")
+
+    def checkpoint(self) -> dict[str | None, int]:
+        """Return an opaque snapshot of the counts for :meth:`count_since`."""
+        snapshot: dict[str | None, int] = {
+            entity_id: bucket["count"] for entity_id, bucket in self.by_script.items()
+        }
+        snapshot[None] = self.count
+        return snapshot
+
+    def count_since(self, checkpoint: dict[str | None, int], entity_id: str | None = None) -> int:
+        """Return how many calls (to *entity_id*, or in total) were made after *checkpoint*."""
+        now = self.count if entity_id is None else self.by_script[entity_id]["count"]
+        return now - checkpoint.get(entity_id, 0)
+
+
+def record_script_calls(hass: HomeAssistant) -> ScriptCallRecorder:
+    """Register a :class:`ScriptCallRecorder` as the ``script.turn_on`` handler and return it."""
+    recorder = ScriptCallRecorder()
+    hass.services.async_register("script", "turn_on", recorder.handle)
+    return recorder
+
+
+def mock_failing_script_service(hass: HomeAssistant, exc: Exception) -> None:
+    """Register a ``script.turn_on`` handler that raises *exc* on every call.
+
+    Fails charger action scripts at the service-handler boundary, leaving
+    every other service untouched.  Re-register a working handler (e.g.
+    ``async_mock_service``) to simulate recovery.
+    """
+
+    @callback
+    def _raise(call: ServiceCall) -> None:
+        # The same instance is raised on every retry; clear the traceback
+        # so frames do not pile up on it.
+        raise exc.with_traceback(None)
+
+    hass.services.async_register("script", "turn_on", _raise)
+
+
+@pytest.fixture
+def script_calls(hass: HomeAssistant) -> ScriptCallRecorder:
+    """Mock the ``script.turn_on`` service and return its :class:`ScriptCallRecorder`."""
+    return record_script_calls(hass)
+
+
+@dataclass(slots=True)
+class ChargingHarness:
+    """Everything a charging-cycle test needs after the integration is set up.
+
+    Bundles the coordinator and the resolved entity ids so tests do not
+    repeat the same lookup boilerplate.  Tests that need the frozen clock or
+    the script-call recorder use the ``freezer`` and ``script_calls``
+    fixtures directly.
+    """
+
+    hass: HomeAssistant
+    coordinator: Any
+    entry_id: str
+    ids: EntityIds
+
+    async def set_meter(self, watts: str) -> None:
+        """Publish a power-meter reading and wait for the coordinator to react."""
+        self.hass.states.async_set(POWER_METER, watts)
+        await self.hass.async_block_till_done()
+
+    def current_set(self) -> float:
+        """Return the charging current currently shown by the current-set sensor."""
+        return state_float(self.hass, self.ids.current_set)
+
+    def snapshot(self) -> SimpleNamespace:
+        """Return the main charger entity states, read once, for a block of assertions.
+
+        ``current_set`` is parsed to a float; ``active``, ``balancer_state``
+        and ``reason`` are the raw state strings.
+        """
+        states = self.hass.states
+        return SimpleNamespace(
+            current_set=state_float(self.hass, self.ids.current_set),
+            active=states.get(self.ids.active).state,
+            balancer_state=states.get(self.ids.balancer_state).state,
+            reason=states.get(self.ids.reason).state,
+        )
+
+    def check(self, phase: str, **expected: Any) -> None:
+        """Assert :meth:`snapshot` fields equal *expected*, labelling failures with *phase*."""
+        snap = self.snapshot()
+        for name, value in expected.items():
+            actual = getattr(snap, name)
+            assert actual == value, f"{phase}: {name} is {actual!r}, expected {value!r}"
+
+
+async def setup_charging_harness(
+    hass: HomeAssistant, entry: MockConfigEntry, ramp_up_time_s: float | None = None
+) -> ChargingHarness:
+    """Set up the integration for *entry* and return a :class:`ChargingHarness` for it.
+
+    When the entry has action scripts, request ``script_calls`` (or call
+    :func:`record_script_calls`) before this so the startup actions are
+    captured too.  Pass ``ramp_up_time_s`` to override the coordinator's
+    ramp-up cooldown, e.g. ``0.0`` to disable it.
+    """
+    await setup_integration(hass, entry)
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    if ramp_up_time_s is not None:
+        coordinator.ramp_up_time_s = ramp_up_time_s
+    return ChargingHarness(
+        hass=hass,
+        coordinator=coordinator,
+        entry_id=entry.entry_id,
+        ids=get_entity_ids(hass, entry),
+    )
+
+
+async def setup_primed_harness(
+    hass: HomeAssistant, entry: MockConfigEntry, ramp_up_time_s: float | None = None
+) -> ChargingHarness:
+    """Set up *entry* and bring it to the standard charging baseline.
+
+    Publishes ``PRIMED_METER_W`` (3000 W → 13.04 A of house load, 18.96 A
+    available) and checks the charger settled at ``PRIMED_CURRENT_A``
+    (18 A), which is the Phase 1 of most scenario tests.
+    ``ramp_up_time_s`` is passed on to :func:`setup_charging_harness`.
+    """
+    h = await setup_charging_harness(hass, entry, ramp_up_time_s)
+    await h.set_meter(PRIMED_METER_W)
+    assert h.current_set() == PRIMED_CURRENT_A
+    assert hass.states.get(h.ids.active).state == "on"
+    return h
+
+
+async def _yield_instead_of_sleep(_delay: float) -> None:
+    """Yield to the event loop once, without waiting for *_delay*."""
+    await asyncio.sleep(0)
+
+
 def no_sleep_coordinator(hass: HomeAssistant, entry: MockConfigEntry):
-    """Return the coordinator with sleep replaced by a no-op for fast tests.
+    """Return the coordinator with sleep replaced by a zero-delay yield for fast tests.
 
     Use this in tests that trigger action failures to avoid real
-    retry delays during the exponential backoff.
+    retry delays during the exponential backoff.  Each backoff still yields
+    to the event loop once, as a real sleep would, and the requested delays
+    remain available on ``coordinator._sleep_fn.call_args_list``.
     """
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    coordinator._sleep_fn = AsyncMock()
+    coordinator._sleep_fn = AsyncMock(side_effect=_yield_instead_of_sleep)
     return coordinator
@@ -7,8 +7,8 @@ Tests cover:
 """
 
 import asyncio
-from unittest.mock import patch
 
+import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 
@@ -23,12 +23,21 @@ from custom_components.ev_lb.const import (
 )
 from conftest import (
     POWER_METER,
+    assert_states,
     collect_events,
-    get_entity_id,
+    get_entity_ids,
+    mock_failing_script_service,
     no_sleep_coordinator,
     setup_integration,
+    state_float,
 )
 
+# Action failures injected through mock_failing_script_service.  The
+# instances are shared; the helper clears the traceback on every raise.
+_ERR_TIMEOUT = asyncio.TimeoutError()
+_ERR_SCRIPT_BROKEN = HomeAssistantError("Script broken")
+_ERR_UNREACHABLE = HomeAssistantError("Charger unreachable")
+
 
 # ---------------------------------------------------------------------------
 # Service-call timeout (asyncio.TimeoutError)
@@ -43,40 +52,44 @@ class TestServiceCallTimeout:
     treat it the same as HomeAssistantError.
     """
 
-    async def test_timeout_triggers_retry_and_records_failure(
+    @pytest.mark.parametrize("error", [_ERR_TIMEOUT, _ERR_UNREACHABLE], ids=["timeout", "ha_error"])
+    async def test_script_failure_records_error_and_backoff(
         self,
         hass: HomeAssistant,
         mock_config_entry_with_actions: MockConfigEntry,
+        error: Exception,
     ) -> None:
-        """Charger command timeout triggers retries and records failure after exhaustion."""
+        """A timeout or HomeAssistantError from a charger command is retried with backoff and recorded as a failure."""
         await setup_integration(hass, mock_config_entry_with_actions)
         coordinator = no_sleep_coordinator(hass, mock_config_entry_with_actions)
+        ids = get_entity_ids(hass, mock_config_entry_with_actions)
         events = collect_events(hass, EVENT_ACTION_FAILED)
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=asyncio.TimeoutError(),
-        ):
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
+        mock_failing_script_service(hass, error)
+        hass.states.async_set(POWER_METER, "3000")
+        await hass.async_block_till_done()
 
         # Failure events should fire after retries are exhausted
         assert len(events) >= 1
 
-        # Diagnostic state should reflect the timeout failure
+        # Diagnostic state should reflect the failure
         assert coordinator.last_action_error is not None
         assert coordinator.last_action_status == "failure"
         assert coordinator.retry_count == ACTION_MAX_RETRIES
 
+        # Diagnostic sensors show the failure details
+        assert hass.states.get(ids.action_status).state == "failure"
+        assert str(error) in hass.states.get(ids.action_error).state
+        assert int(hass.states.get(ids.retry_count).state) == ACTION_MAX_RETRIES
+        assert state_float(hass, ids.action_latency) >= 0
+
         # Sleep should have been called with exponential backoff delays.
         # Each failing action produces ACTION_MAX_RETRIES sleep calls with
         # delays 2^0=1 s, 2^1=2 s, 2^2=4 s (base delay × 2^attempt).
         sleep_calls = [c.args[0] for c in coordinator._sleep_fn.call_args_list]
         expected_pattern = [1.0, 2.0, 4.0]
-        # Each failed action produces the same backoff pattern; verify in chunks.
-        for i in range(0, len(sleep_calls), ACTION_MAX_RETRIES):
-            chunk = sleep_calls[i : i + ACTION_MAX_RETRIES]
-            assert chunk == expected_pattern
+        # Each failed action produces the same backoff pattern, back to back.
+        assert sleep_calls == expected_pattern * (len(sleep_calls) // ACTION_MAX_RETRIES)
 
     async def test_timeout_recovery_clears_error(
         self,
@@ -88,12 +101,9 @@ class TestServiceCallTimeout:
         coordinator = no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
         # Step 1: Cause a timeout failure
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=asyncio.TimeoutError(),
-        ):
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
+        mock_failing_script_service(hass, _ERR_TIMEOUT)
+        hass.states.async_set(POWER_METER, "3000")
+        await hass.async_block_till_done()
 
         assert coordinator.last_action_status == "failure"
 
@@ -128,45 +138,13 @@ class TestHealthEntityTransitionsDuringActionFailure:
         await setup_integration(hass, mock_config_entry_with_actions)
         no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        meter_status_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "meter_status")
+        ids = get_entity_ids(hass, mock_config_entry_with_actions)
 
         # Action scripts fail, but balancer should still compute and report correct state
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Script broken"),
-        ):
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
+        mock_failing_script_service(hass, _ERR_SCRIPT_BROKEN)
+        hass.states.async_set(POWER_METER, "3000")
+        await hass.async_block_till_done()
 
         # Coordinator computes 18 A — entities should reflect this
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(meter_status_id).state == "on"
-
-    async def test_diagnostic_sensors_update_after_action_failure_cycle(
-        self,
-        hass: HomeAssistant,
-        mock_config_entry_with_actions: MockConfigEntry,
-    ) -> None:
-        """Diagnostic sensors show failure details after action scripts fail."""
-        await setup_integration(hass, mock_config_entry_with_actions)
-        no_sleep_coordinator(hass, mock_config_entry_with_actions)
-
-        action_status_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "last_action_status")
-        action_error_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "last_action_error")
-        retry_count_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "retry_count")
-        latency_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "action_latency")
-
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Charger unreachable"),
-        ):
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
-
-        assert hass.states.get(action_status_id).state == "failure"
-        assert "Charger unreachable" in hass.states.get(action_error_id).state
-        assert int(hass.states.get(retry_count_id).state) == ACTION_MAX_RETRIES
-        assert float(hass.states.get(latency_id).state) >= 0
+        assert state_float(hass, ids.current_set) == 18.0
+        assert_states(hass, {ids.active: "on", ids.meter_status: "on"})
@@ -6,8 +6,9 @@ Tests cover scenarios where multiple fault conditions occur at the same time:
 - Meter flapping with concurrent action failures
 """
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock
 
+import pytest
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 
@@ -20,28 +21,30 @@ from custom_components.ev_lb.const import (
     CONF_ACTION_SET_CURRENT,
     CONF_ACTION_START_CHARGING,
     CONF_ACTION_STOP_CHARGING,
-    CONF_MAX_SERVICE_CURRENT,
-    CONF_POWER_METER_ENTITY,
     CONF_UNAVAILABLE_BEHAVIOR,
     CONF_UNAVAILABLE_FALLBACK_CURRENT,
-    CONF_VOLTAGE,
     DOMAIN,
     EVENT_ACTION_FAILED,
+    EVENT_FALLBACK_ACTIVATED,
     EVENT_METER_UNAVAILABLE,
     REASON_FALLBACK_UNAVAILABLE,
     REASON_POWER_METER_UPDATE,
     UNAVAILABLE_BEHAVIOR_SET_CURRENT,
     UNAVAILABLE_BEHAVIOR_STOP,
 )
+from custom_components.ev_lb.coordinator import EvLoadBalancerCoordinator
 from conftest import (
     POWER_METER,
     SET_CURRENT_SCRIPT,
     STOP_CHARGING_SCRIPT,
     START_CHARGING_SCRIPT,
-    collect_events,
-    get_entity_id,
+    _BASE_CONFIG,
+    assert_states,
+    count_events,
+    get_entity_ids,
     no_sleep_coordinator,
     setup_integration,
+    state_float,
 )
 
 
@@ -49,6 +52,25 @@ from conftest import (
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Action failures injected through service_call_mock.  The instances are shared;
+# the fixture re-raises them with a fresh traceback each time.
+_ERR_OFFLINE = HomeAssistantError("Charger offline")
+_ERR_REFUSED = HomeAssistantError("Connection refused")
+_ERR_TIMEOUT = HomeAssistantError("Charger timeout")
+_ERR_UNREACHABLE = HomeAssistantError("Charger unreachable")
+_ERR_NETWORK = HomeAssistantError("Network error")
+
+# Meter flap used by the flapping tests: unavailable → recover → unavailable.
+_METER_FLAP = ["unavailable", "3000", "unavailable"]
+
+# Entry data shared by every fault scenario; only the fallback settings vary.
+_ACTIONS_ENTRY_DATA = {
+    **_BASE_CONFIG,
+    CONF_ACTION_SET_CURRENT: SET_CURRENT_SCRIPT,
+    CONF_ACTION_STOP_CHARGING: STOP_CHARGING_SCRIPT,
+    CONF_ACTION_START_CHARGING: START_CHARGING_SCRIPT,
+}
+
 
 def _entry_with_actions_and_fallback(behavior: str, fallback_a: float = 10.0) -> MockConfigEntry:
     """Create a config entry with action scripts and a specific fallback behavior.
@@ -61,12 +83,7 @@ def _entry_with_actions_and_fallback(behavior: str, fallback_a: float = 10.0) ->
     return MockConfigEntry(
         domain=DOMAIN,
         data={
-            CONF_POWER_METER_ENTITY: POWER_METER,
-            CONF_VOLTAGE: 230.0,
-            CONF_MAX_SERVICE_CURRENT: 32.0,
-            CONF_ACTION_SET_CURRENT: SET_CURRENT_SCRIPT,
-            CONF_ACTION_STOP_CHARGING: STOP_CHARGING_SCRIPT,
-            CONF_ACTION_START_CHARGING: START_CHARGING_SCRIPT,
+            **_ACTIONS_ENTRY_DATA,
             CONF_UNAVAILABLE_BEHAVIOR: behavior,
             CONF_UNAVAILABLE_FALLBACK_CURRENT: fallback_a,
         },
@@ -74,6 +91,30 @@ def _entry_with_actions_and_fallback(behavior: str, fallback_a: float = 10.0) ->
     )
 
 
+async def _setup_fault_scenario(
+    hass: HomeAssistant, behavior: str, fallback_a: float = 10.0
+) -> tuple[MockConfigEntry, EvLoadBalancerCoordinator]:
+    """Set up an entry with action scripts and *behavior* fallback, ready for fault injection.
+
+    Returns the loaded entry and its coordinator with retry sleeps disabled,
+    so failing actions do not wait out the real backoff delays.
+    """
+    entry = _entry_with_actions_and_fallback(behavior, fallback_a)
+    await setup_integration(hass, entry)
+    return entry, no_sleep_coordinator(hass, entry)
+
+
+async def _flap_meter(hass: HomeAssistant) -> None:
+    """Publish the :data:`_METER_FLAP` readings, settling after each one.
+
+    Draining per reading lets every transition run (and fail) its own
+    charger action instead of being cancelled by the next reading.
+    """
+    for state in _METER_FLAP:
+        hass.states.async_set(POWER_METER, state)
+        await hass.async_block_till_done()
+
+
 # ---------------------------------------------------------------------------
 # Compound fault: action failure during meter fallback
 # ---------------------------------------------------------------------------
@@ -82,95 +123,69 @@ def _entry_with_actions_and_fallback(behavior: str, fallback_a: float = 10.0) ->
 class TestActionFailureDuringMeterFallback:
     """Charger state remains safe when action scripts fail during a meter unavailability transition.
 
-    When the power meter goes unavailable and the stop_charging action script
-    also fails, the coordinator must still apply the fallback current (0 A for
-    stop mode) and update all health entities correctly.
+    When the power meter goes unavailable and the charger action script also
+    fails, the coordinator must still apply the fallback current (0 A for stop
+    mode, the configured current for set_current mode) and update all health
+    entities correctly.
     """
 
-    async def test_stop_mode_fallback_applies_despite_action_failure(
-        self, hass: HomeAssistant,
+    @pytest.mark.parametrize(
+        ("behavior", "fallback_a", "expected_current", "expected_active", "fault_event", "error"),
+        [
+            (UNAVAILABLE_BEHAVIOR_STOP, 10.0, 0.0, "off", EVENT_METER_UNAVAILABLE, _ERR_OFFLINE),
+            (UNAVAILABLE_BEHAVIOR_SET_CURRENT, 8.0, 8.0, "on", EVENT_FALLBACK_ACTIVATED, _ERR_REFUSED),
+        ],
+        ids=["stop", "set_current"],
+    )
+    async def test_fallback_applies_despite_action_failure(
+        self,
+        hass: HomeAssistant,
+        service_call_mock: AsyncMock,
+        behavior: str,
+        fallback_a: float,
+        expected_current: float,
+        expected_active: str,
+        fault_event: str,
+        error: HomeAssistantError,
     ) -> None:
-        """Charging stops and health entities update even when the stop action script fails."""
-        entry = _entry_with_actions_and_fallback(UNAVAILABLE_BEHAVIOR_STOP)
-        await setup_integration(hass, entry)
-        coordinator = no_sleep_coordinator(hass, entry)
+        """Fallback current is applied and health entities update even when the charger action fails."""
+        entry, coordinator = await _setup_fault_scenario(hass, behavior, fallback_a)
         coordinator.ramp_up_time_s = 0.0
 
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, entry, "binary_sensor", "active")
-        meter_status_id = get_entity_id(hass, entry, "binary_sensor", "meter_status")
-        fallback_active_id = get_entity_id(hass, entry, "binary_sensor", "fallback_active")
-        reason_id = get_entity_id(hass, entry, "sensor", "last_action_reason")
-        action_status_id = get_entity_id(hass, entry, "sensor", "last_action_status")
-        action_error_id = get_entity_id(hass, entry, "sensor", "last_action_error")
+        ids = get_entity_ids(hass, entry)
 
-        meter_events = collect_events(hass, EVENT_METER_UNAVAILABLE)
-        action_events = collect_events(hass, EVENT_ACTION_FAILED)
+        fault_events = count_events(hass, fault_event)
+        action_events = count_events(hass, EVENT_ACTION_FAILED)
 
         # Phase 1: Normal charging at 18 A
         async_mock_service(hass, "script", "turn_on")
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(active_id).state == "on"
+        assert state_float(hass, ids.current_set) == 18.0
+        assert hass.states.get(ids.active).state == "on"
 
         # Phase 2: Meter goes unavailable AND action scripts fail
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Charger offline"),
-        ):
-            hass.states.async_set(POWER_METER, "unavailable")
-            await hass.async_block_till_done()
+        service_call_mock.side_effect = error
+        hass.states.async_set(POWER_METER, "unavailable")
+        await hass.async_block_till_done()
 
         # Fallback must still apply — coordinator state is correct regardless of action failure
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
-        assert hass.states.get(meter_status_id).state == "off"
-        assert hass.states.get(fallback_active_id).state == "on"
-        assert hass.states.get(reason_id).state == REASON_FALLBACK_UNAVAILABLE
+        assert state_float(hass, ids.current_set) == expected_current
+        assert_states(hass, {
+            ids.active: expected_active,
+            ids.meter_status: "off",
+            ids.fallback_active: "on",
+            ids.reason: REASON_FALLBACK_UNAVAILABLE,
+        })
 
         # Both fault types should be signaled
-        assert len(meter_events) >= 1
-        assert len(action_events) >= 1
+        assert fault_events() >= 1
+        assert action_events() >= 1
 
         # Diagnostic sensors should reflect the action failure
-        assert hass.states.get(action_status_id).state == "failure"
-        assert "Charger offline" in hass.states.get(action_error_id).state
-
-    async def test_set_current_fallback_applies_despite_action_failure(
-        self, hass: HomeAssistant,
-    ) -> None:
-        """Fallback current is applied and health entities update even when the set_current action fails."""
-        entry = _entry_with_actions_and_fallback(UNAVAILABLE_BEHAVIOR_SET_CURRENT, fallback_a=8.0)
-        await setup_integration(hass, entry)
-        no_sleep_coordinator(hass, entry)
-
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, entry, "binary_sensor", "active")
-        meter_status_id = get_entity_id(hass, entry, "binary_sensor", "meter_status")
-        fallback_active_id = get_entity_id(hass, entry, "binary_sensor", "fallback_active")
-
-        # Phase 1: Normal charging
-        async_mock_service(hass, "script", "turn_on")
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Phase 2: Meter goes unavailable AND action scripts fail
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Connection refused"),
-        ):
-            hass.states.async_set(POWER_METER, "unavailable")
-            await hass.async_block_till_done()
-
-        # Fallback current must still be applied to coordinator state
-        assert float(hass.states.get(current_set_id).state) == 8.0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(meter_status_id).state == "off"
-        assert hass.states.get(fallback_active_id).state == "on"
+        assert hass.states.get(ids.action_status).state == "failure"
+        assert str(error) in hass.states.get(ids.action_error).state
 
 
 # ---------------------------------------------------------------------------
@@ -188,90 +203,75 @@ class TestActionFailureDuringRecovery:
     """
 
     async def test_recovery_computes_correct_current_despite_action_failure(
-        self, hass: HomeAssistant,
+        self, hass: HomeAssistant, service_call_mock: AsyncMock,
     ) -> None:
         """Correct charging current is computed on meter recovery even when actions fail."""
-        entry = _entry_with_actions_and_fallback(UNAVAILABLE_BEHAVIOR_STOP)
-        await setup_integration(hass, entry)
-        coordinator = no_sleep_coordinator(hass, entry)
+        entry, coordinator = await _setup_fault_scenario(hass, UNAVAILABLE_BEHAVIOR_STOP)
         coordinator.ramp_up_time_s = 0.0
 
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, entry, "binary_sensor", "active")
-        meter_status_id = get_entity_id(hass, entry, "binary_sensor", "meter_status")
-        fallback_active_id = get_entity_id(hass, entry, "binary_sensor", "fallback_active")
-        reason_id = get_entity_id(hass, entry, "sensor", "last_action_reason")
+        ids = get_entity_ids(hass, entry)
 
         # Phase 1: Normal charging
         async_mock_service(hass, "script", "turn_on")
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert state_float(hass, ids.current_set) == 18.0
 
         # Phase 2: Meter goes unavailable → stop fallback
         hass.states.async_set(POWER_METER, "unavailable")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(fallback_active_id).state == "on"
+        assert state_float(hass, ids.current_set) == 0.0
+        assert hass.states.get(ids.fallback_active).state == "on"
 
         # Phase 3: Meter recovers but action scripts fail
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Charger timeout"),
-        ):
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
+        service_call_mock.side_effect = _ERR_TIMEOUT
+        hass.states.async_set(POWER_METER, "3000")
+        await hass.async_block_till_done()
 
         # Computed state should reflect recovery even though actions failed
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(meter_status_id).state == "on"
-        assert hass.states.get(fallback_active_id).state == "off"
-        assert hass.states.get(reason_id).state == REASON_POWER_METER_UPDATE
+        assert state_float(hass, ids.current_set) == 18.0
+        assert_states(hass, {
+            ids.active: "on",
+            ids.meter_status: "on",
+            ids.fallback_active: "off",
+            ids.reason: REASON_POWER_METER_UPDATE,
+        })
 
         # Action failure is still recorded in diagnostics
         assert coordinator.last_action_status == "failure"
         assert coordinator.last_action_error is not None
 
     async def test_set_current_fallback_to_recovery_with_action_failure(
-        self, hass: HomeAssistant,
+        self, hass: HomeAssistant, service_call_mock: AsyncMock,
     ) -> None:
         """Transition from fallback current to computed current is correct despite action failure at recovery."""
-        entry = _entry_with_actions_and_fallback(UNAVAILABLE_BEHAVIOR_SET_CURRENT, fallback_a=10.0)
-        await setup_integration(hass, entry)
-        coordinator = no_sleep_coordinator(hass, entry)
+        entry, coordinator = await _setup_fault_scenario(hass, UNAVAILABLE_BEHAVIOR_SET_CURRENT, fallback_a=10.0)
 
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        fallback_active_id = get_entity_id(hass, entry, "binary_sensor", "fallback_active")
-        meter_status_id = get_entity_id(hass, entry, "binary_sensor", "meter_status")
+        ids = get_entity_ids(hass, entry)
 
         # Phase 1: Normal charging
         async_mock_service(hass, "script", "turn_on")
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert state_float(hass, ids.current_set) == 18.0
 
         # Phase 2: Meter unavailable → fallback to 10 A
         hass.states.async_set(POWER_METER, "unavailable")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 10.0
-        assert hass.states.get(fallback_active_id).state == "on"
+        assert state_float(hass, ids.current_set) == 10.0
+        assert hass.states.get(ids.fallback_active).state == "on"
 
         # Phase 3: Meter recovers but actions fail
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Charger unreachable"),
-        ):
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
+        service_call_mock.side_effect = _ERR_UNREACHABLE
+        hass.states.async_set(POWER_METER, "3000")
+        await hass.async_block_till_done()
 
         # Coordinator computes from live meter despite action failure.
         # Formula: service=3000W/230V≈13A, ev_estimate=10A (fallback),
         # non_ev=13−10=3A, available=32−3=29A → clamped to charger max.
-        recovered = float(hass.states.get(current_set_id).state)
+        recovered = state_float(hass, ids.current_set)
         assert recovered > 0
-        assert hass.states.get(fallback_active_id).state == "off"
-        assert hass.states.get(meter_status_id).state == "on"
+        assert_states(hass, {ids.fallback_active: "off", ids.meter_status: "on"})
         assert coordinator.last_action_status == "failure"
 
 
@@ -289,89 +289,65 @@ class TestMeterFlappingWithActionFailures:
     """
 
     async def test_meter_flap_with_action_failures_reaches_consistent_state(
-        self, hass: HomeAssistant,
+        self, hass: HomeAssistant, service_call_mock: AsyncMock,
     ) -> None:
         """Rapid meter unavailable/recovery cycles with failing actions result in correct final state."""
-        entry = _entry_with_actions_and_fallback(UNAVAILABLE_BEHAVIOR_STOP)
-        await setup_integration(hass, entry)
-        coordinator = no_sleep_coordinator(hass, entry)
+        entry, coordinator = await _setup_fault_scenario(hass, UNAVAILABLE_BEHAVIOR_STOP)
         coordinator.ramp_up_time_s = 0.0
 
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, entry, "binary_sensor", "active")
-        meter_status_id = get_entity_id(hass, entry, "binary_sensor", "meter_status")
-        fallback_active_id = get_entity_id(hass, entry, "binary_sensor", "fallback_active")
+        ids = get_entity_ids(hass, entry)
 
         # Phase 1: Normal charging
         async_mock_service(hass, "script", "turn_on")
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert state_float(hass, ids.current_set) == 18.0
 
         # Phase 2: All actions fail from now on
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Network error"),
-        ):
-            # Meter flap: unavailable → recover → unavailable
-            hass.states.async_set(POWER_METER, "unavailable")
-            await hass.async_block_till_done()
-
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
-
-            hass.states.async_set(POWER_METER, "unavailable")
-            await hass.async_block_till_done()
+        service_call_mock.side_effect = _ERR_NETWORK
+        await _flap_meter(hass)
 
         # Final state: meter unavailable in stop mode → 0 A, fallback active
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
-        assert hass.states.get(meter_status_id).state == "off"
-        assert hass.states.get(fallback_active_id).state == "on"
+        assert state_float(hass, ids.current_set) == 0.0
+        assert_states(hass, {
+            ids.active: "off",
+            ids.meter_status: "off",
+            ids.fallback_active: "on",
+        })
 
     async def test_meter_recovers_after_flap_with_action_failures(
-        self, hass: HomeAssistant,
+        self, hass: HomeAssistant, service_call_mock: AsyncMock,
     ) -> None:
         """System recovers fully when the meter stabilises and actions start working again."""
-        entry = _entry_with_actions_and_fallback(UNAVAILABLE_BEHAVIOR_STOP)
-        await setup_integration(hass, entry)
-        coordinator = no_sleep_coordinator(hass, entry)
+        entry, coordinator = await _setup_fault_scenario(hass, UNAVAILABLE_BEHAVIOR_STOP)
         coordinator.ramp_up_time_s = 0.0
 
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, entry, "binary_sensor", "active")
-        meter_status_id = get_entity_id(hass, entry, "binary_sensor", "meter_status")
-        fallback_active_id = get_entity_id(hass, entry, "binary_sensor", "fallback_active")
+        ids = get_entity_ids(hass, entry)
 
         # Phase 1: Normal charging
         async_mock_service(hass, "script", "turn_on")
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert state_float(hass, ids.current_set) == 18.0
 
         # Phase 2: Meter flaps with failing actions
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
-            side_effect=HomeAssistantError("Network error"),
-        ):
-            hass.states.async_set(POWER_METER, "unavailable")
-            await hass.async_block_till_done()
-            hass.states.async_set(POWER_METER, "3000")
-            await hass.async_block_till_done()
-            hass.states.async_set(POWER_METER, "unavailable")
-            await hass.async_block_till_done()
+        service_call_mock.side_effect = _ERR_NETWORK
+        await _flap_meter(hass)
 
         # Phase 3: Both meter and actions recover
+        service_call_mock.side_effect = None
         async_mock_service(hass, "script", "turn_on")
         hass.states.async_set(POWER_METER, "4000")
         await hass.async_block_till_done()
 
         # Should be back to normal operation
-        recovered = float(hass.states.get(current_set_id).state)
+        recovered = state_float(hass, ids.current_set)
         assert recovered > 0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(meter_status_id).state == "on"
-        assert hass.states.get(fallback_active_id).state == "off"
+        assert_states(hass, {
+            ids.active: "on",
+            ids.meter_status: "on",
+            ids.fallback_active: "off",
+        })
 
         # Diagnostic sensors should show the successful recovery
         assert coordinator.last_action_status == "success"
@@ -7,10 +7,7 @@ set_limit service — all during active charging operation.
 
 from homeassistant.core import HomeAssistant
 
-from pytest_homeassistant_custom_component.common import (
-    MockConfigEntry,
-    async_mock_service,
-)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.ev_lb.const import (
     DOMAIN,
@@ -27,11 +24,42 @@ from conftest import (
     SET_CURRENT_SCRIPT,
     STOP_CHARGING_SCRIPT,
     START_CHARGING_SCRIPT,
-    setup_integration,
-    get_entity_id,
+    ChargingHarness,
+    ScriptCallRecorder,
+    setup_primed_harness,
 )
 
 
+async def _disable_and_feed_meter(hass: HomeAssistant, h: ChargingHarness, readings: list[str]) -> None:
+    """Turn load balancing off, then publish *readings* and check each one is ignored."""
+    value_before_disable = h.current_set()
+    await hass.services.async_call(
+        "switch", "turn_off", {"entity_id": h.ids.enabled}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    for watts in readings:
+        await h.set_meter(watts)
+
+        # Current should remain unchanged; balancer_state set to disabled on meter event
+        h.check(f"disabled at {watts} W", current_set=value_before_disable, balancer_state=STATE_DISABLED)
+
+
+async def _reenable_and_check_recompute(hass: HomeAssistant, h: ChargingHarness) -> None:
+    """Turn load balancing back on and check it recomputed from the last meter reading."""
+    await hass.services.async_call(
+        "switch", "turn_on", {"entity_id": h.ids.enabled}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    snap = h.snapshot()
+    # Should reflect the last reading, not the ones seen while disabled,
+    # e.g. 5000 W: raw_target = 18 + (32 - 5000/230) = 18 + 10.26 = 28.26 → 28 A
+    assert snap.current_set > 0
+    assert snap.active == "on"
+    assert snap.balancer_state != STATE_DISABLED
+
+
 # ---------------------------------------------------------------------------
 # Scenario 3: Runtime parameter changes during active charging
 # ---------------------------------------------------------------------------
@@ -48,82 +76,63 @@ class TestParameterChangesDuringCharging:
         self,
         hass: HomeAssistant,
         mock_config_entry_with_actions: MockConfigEntry,
+        script_calls: ScriptCallRecorder,
     ) -> None:
         """Lowering max caps charger, raising min EV stops it, auto-resume restores charging."""
-        calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0  # Disable cooldown for clean transitions
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
-        max_current_id = get_entity_id(hass, mock_config_entry_with_actions, "number", "max_charger_current")
-        min_current_id = get_entity_id(hass, mock_config_entry_with_actions, "number", "min_ev_current")
-        reason_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "last_action_reason")
-
         # Phase 1: Start charging at 18 A (3000 W at 230 V)
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
+        h = await setup_primed_harness(hass, mock_config_entry_with_actions)
+        h.coordinator.ramp_up_time_s = 0.0  # Disable cooldown for clean transitions
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(active_id).state == "on"
-
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # Phase 2: Lower max charger current to 10 A → immediate cap
         await hass.services.async_call(
             "number",
             "set_value",
-            {"entity_id": max_current_id, "value": 10.0},
+            {"entity_id": h.ids.max_charger_current, "value": 10.0},
             blocking=True,
         )
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 10.0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(reason_id).state == REASON_PARAMETER_CHANGE
+        h.check("max lowered", current_set=10.0, active="on", reason=REASON_PARAMETER_CHANGE)
 
         # set_current action should fire for the adjustment
-        set_calls = [c for c in calls if c.data["entity_id"] == SET_CURRENT_SCRIPT]
-        assert len(set_calls) >= 1
-        assert set_calls[-1].data["variables"]["current_a"] == 10.0
+        assert script_calls.count_since(calls_before, SET_CURRENT_SCRIPT) >= 1
+        assert script_calls.by_script[SET_CURRENT_SCRIPT]["last"]["current_a"] == 10.0
 
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # Phase 3: Raise min EV current to 12 A → current (10) < min (12) → stop
         await hass.services.async_call(
             "number",
             "set_value",
-            {"entity_id": min_current_id, "value": 12.0},
+            {"entity_id": h.ids.min_ev_current, "value": 12.0},
             blocking=True,
         )
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        h.check("min raised", current_set=0.0, active="off")
 
         # stop_charging action should fire
-        stop_calls = [c for c in calls if c.data["entity_id"] == STOP_CHARGING_SCRIPT]
-        assert len(stop_calls) >= 1
+        assert script_calls.count_since(calls_before, STOP_CHARGING_SCRIPT) >= 1
 
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # Phase 4: Lower min EV current back to 6 A → recompute → resume
         await hass.services.async_call(
             "number",
             "set_value",
-            {"entity_id": min_current_id, "value": 6.0},
+            {"entity_id": h.ids.min_ev_current, "value": 6.0},
             blocking=True,
         )
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 10.0  # Capped at max=10
-        assert hass.states.get(active_id).state == "on"
+        h.check("min restored", current_set=10.0, active="on")  # Capped at max=10
 
         # start_charging + set_current should fire (resume)
-        assert len(calls) == 2
-        assert calls[0].data["entity_id"] == START_CHARGING_SCRIPT
-        assert calls[1].data["entity_id"] == SET_CURRENT_SCRIPT
+        assert script_calls.count_since(calls_before) == 2
+        assert script_calls.count_since(calls_before, START_CHARGING_SCRIPT) == 1
+        assert script_calls.last_entity_id == SET_CURRENT_SCRIPT
 
 
 # ---------------------------------------------------------------------------
@@ -142,23 +151,14 @@ class TestManualOverrideAndResume:
         self,
         hass: HomeAssistant,
         mock_config_entry_with_actions: MockConfigEntry,
+        script_calls: ScriptCallRecorder,
     ) -> None:
         """Manual override fires correct actions and reason, auto-balancing resumes on next meter event."""
-        calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
-        reason_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "last_action_reason")
-
         # Phase 1: Normal charging at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
+        h = await setup_primed_harness(hass, mock_config_entry_with_actions)
+        h.check("balancing", reason=REASON_POWER_METER_UPDATE)
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(reason_id).state == REASON_POWER_METER_UPDATE
-
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # Phase 2: Manual override to 10 A
         await hass.services.async_call(
@@ -169,29 +169,26 @@ class TestManualOverrideAndResume:
         )
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 10.0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(reason_id).state == REASON_MANUAL_OVERRIDE
+        h.check("override", current_set=10.0, active="on", reason=REASON_MANUAL_OVERRIDE)
 
         # set_current action should fire for the adjustment
-        set_calls = [c for c in calls if c.data["entity_id"] == SET_CURRENT_SCRIPT]
-        assert len(set_calls) >= 1
-        assert set_calls[-1].data["variables"]["current_a"] == 10.0
+        assert script_calls.count_since(calls_before, SET_CURRENT_SCRIPT) >= 1
+        assert script_calls.by_script[SET_CURRENT_SCRIPT]["last"]["current_a"] == 10.0
 
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # Phase 3: Next meter event → automatic balancing resumes
         # 3000 W → available = 18.96, raw_target = 10 + 18.96 = 28.96 → 28 A
         hass.states.async_set(POWER_METER, "3002")
         await hass.async_block_till_done()
 
-        auto_value = float(hass.states.get(current_set_id).state)
+        snap = h.snapshot()
+        auto_value = snap.current_set
         assert auto_value > 10.0  # No longer at manual override value
-        assert hass.states.get(reason_id).state == REASON_POWER_METER_UPDATE
+        assert snap.reason == REASON_POWER_METER_UPDATE
 
         # set_current action should fire for the adjustment
-        set_calls = [c for c in calls if c.data["entity_id"] == SET_CURRENT_SCRIPT]
-        assert len(set_calls) >= 1
+        assert script_calls.count_since(calls_before, SET_CURRENT_SCRIPT) >= 1
 
 
 # ---------------------------------------------------------------------------
@@ -210,52 +207,14 @@ class TestSwitchToggleDuringOperation:
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
     ) -> None:
         """Meter events are ignored while disabled, and re-enabling triggers immediate recompute with correct state."""
-        await setup_integration(hass, mock_config_entry)
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-        switch_id = get_entity_id(hass, mock_config_entry, "switch", "enabled")
-        state_id = get_entity_id(hass, mock_config_entry, "sensor", "balancer_state")
-
         # Phase 1: Normal charging at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        value_before_disable = float(hass.states.get(current_set_id).state)
-        assert value_before_disable == 18.0
-        assert hass.states.get(active_id).state == "on"
-
-        # Phase 2: Disable load balancing
-        await hass.services.async_call(
-            "switch", "turn_off", {"entity_id": switch_id}, blocking=True
-        )
-        await hass.async_block_till_done()
-
-        # Phase 3: Meter changes while disabled → should be ignored
-        hass.states.async_set(POWER_METER, "8000")
-        await hass.async_block_till_done()
+        h = await setup_primed_harness(hass, mock_config_entry)
 
-        # Current should remain unchanged; balancer_state set to disabled on meter event
-        assert float(hass.states.get(current_set_id).state) == value_before_disable
-        assert hass.states.get(state_id).state == STATE_DISABLED
+        # Phases 2-3: Disable, then meter swings are ignored
+        await _disable_and_feed_meter(hass, h, ["8000", "5000"])
 
-        # Phase 4: Change meter to a different value (still disabled)
-        hass.states.async_set(POWER_METER, "5000")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == value_before_disable
-
-        # Phase 5: Re-enable → immediate recompute from current meter value (5000 W)
-        await hass.services.async_call(
-            "switch", "turn_on", {"entity_id": switch_id}, blocking=True
-        )
-        await hass.async_block_till_done()
-
-        recomputed = float(hass.states.get(current_set_id).state)
-        # Should reflect 5000 W meter reading, not the old 3000 W or 8000 W
-        # raw_target = 18 + (32 - 5000/230) = 18 + 10.26 = 28.26 → 28 A
-        assert recomputed > 0
-        assert hass.states.get(state_id).state != STATE_DISABLED
+        # Phase 4: Re-enable → immediate recompute from current meter value (5000 W)
+        await _reenable_and_check_recompute(hass, h)
 
 
 # ---------------------------------------------------------------------------
@@ -274,59 +233,22 @@ class TestDisableEnableWithActions:
         self,
         hass: HomeAssistant,
         mock_config_entry_with_actions: MockConfigEntry,
+        script_calls: ScriptCallRecorder,
     ) -> None:
         """No charger commands are sent while disabled; re-enabling fires the correct resume actions."""
-        calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
-        switch_id = get_entity_id(hass, mock_config_entry_with_actions, "switch", "enabled")
-        state_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "balancer_state")
-
         # Phase 1: Start charging at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(active_id).state == "on"
-
-        calls.clear()
-
-        # Phase 2: Disable load balancing
-        await hass.services.async_call(
-            "switch", "turn_off", {"entity_id": switch_id}, blocking=True
-        )
-        await hass.async_block_till_done()
+        h = await setup_primed_harness(hass, mock_config_entry_with_actions)
+        calls_before = script_calls.checkpoint()
 
-        # Phase 3: Multiple meter changes while disabled → no actions should fire
-        hass.states.async_set(POWER_METER, "8000")
-        await hass.async_block_till_done()
+        # Phases 2-3: Disable, then the meter changes while disabled → no actions fire
+        await _disable_and_feed_meter(hass, h, ["5000"])
 
-        hass.states.async_set(POWER_METER, "1000")
-        await hass.async_block_till_done()
-
-        hass.states.async_set(POWER_METER, "5000")
-        await hass.async_block_till_done()
-
-        assert len(calls) == 0  # No actions while disabled
-        assert hass.states.get(state_id).state == STATE_DISABLED
+        assert script_calls.count_since(calls_before) == 0  # No actions while disabled
 
         # Phase 4: Re-enable → immediate recompute + actions fire
-        await hass.services.async_call(
-            "switch", "turn_on", {"entity_id": switch_id}, blocking=True
-        )
-        await hass.async_block_till_done()
-
-        recomputed = float(hass.states.get(current_set_id).state)
-        assert recomputed > 0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(state_id).state != STATE_DISABLED
+        await _reenable_and_check_recompute(hass, h)
 
-        # Actions should fire for the resume/adjustment transition
-        assert len(calls) > 0
-        set_calls = [c for c in calls if c.data["entity_id"] == SET_CURRENT_SCRIPT]
-        assert len(set_calls) >= 1
+        assert script_calls.count_since(calls_before, SET_CURRENT_SCRIPT) >= 1
 
 
 # ---------------------------------------------------------------------------
@@ -346,62 +268,31 @@ class TestDisableDuringOverloadAndReenable:
         self,
         hass: HomeAssistant,
         mock_config_entry_with_actions: MockConfigEntry,
+        script_calls: ScriptCallRecorder,
     ) -> None:
         """Charger stays stopped while disabled during overload, then resumes correctly on re-enable."""
-        calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0  # Disable cooldown
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
-        switch_id = get_entity_id(hass, mock_config_entry_with_actions, "switch", "enabled")
-        state_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "balancer_state")
-
         # Phase 1: Start charging
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        h = await setup_primed_harness(hass, mock_config_entry_with_actions)
+        h.coordinator.ramp_up_time_s = 0.0  # Disable cooldown
 
         # Phase 2: Overload → stop
         hass.states.async_set(POWER_METER, "14000")
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        h.check("overload", current_set=0.0, active="off")
+        calls_before = script_calls.checkpoint()
 
-        # Phase 3: Disable load balancing while stopped
-        await hass.services.async_call(
-            "switch", "turn_off", {"entity_id": switch_id}, blocking=True
-        )
-        await hass.async_block_till_done()
+        # Phases 3-4: Disable while stopped, then load drops → no action
+        await _disable_and_feed_meter(hass, h, ["3000"])
 
-        calls.clear()
-
-        # Phase 4: Load drops while disabled → no action
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        assert len(calls) == 0  # Nothing fires while disabled
-        assert hass.states.get(state_id).state == STATE_DISABLED
+        assert script_calls.count_since(calls_before) == 0  # Nothing fires while disabled
 
         # Phase 5: Re-enable → should immediately recompute and resume
-        await hass.services.async_call(
-            "switch", "turn_on", {"entity_id": switch_id}, blocking=True
-        )
-        await hass.async_block_till_done()
-
-        recomputed = float(hass.states.get(current_set_id).state)
-        assert recomputed > 0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(state_id).state != STATE_DISABLED
+        await _reenable_and_check_recompute(hass, h)
 
         # start_charging + set_current should fire for the resume
-        start_calls = [c for c in calls if c.data["entity_id"] == START_CHARGING_SCRIPT]
-        set_calls = [c for c in calls if c.data["entity_id"] == SET_CURRENT_SCRIPT]
-        assert len(start_calls) >= 1
-        assert len(set_calls) >= 1
+        assert script_calls.count_since(calls_before, START_CHARGING_SCRIPT) >= 1
+        assert script_calls.count_since(calls_before, SET_CURRENT_SCRIPT) >= 1
 
 
 # ---------------------------------------------------------------------------
@@ -422,80 +313,65 @@ class TestMaxChargerZeroStopAndResumeCycle:
         self,
         hass: HomeAssistant,
         mock_config_entry_with_actions: MockConfigEntry,
+        script_calls: ScriptCallRecorder,
     ) -> None:
         """Charging stops when max is 0, meter events are ignored while stopped,
         and charging resumes when max is restored."""
-        calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0  # Disable cooldown for clean transitions
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
-        max_id = get_entity_id(hass, mock_config_entry_with_actions, "number", "max_charger_current")
-        state_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "balancer_state")
-        reason_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "last_action_reason")
-
         # --- Phase 1: Normal load-balanced charging at 18 A ---
         # 3000 W / 230 V = 13.04 A → available = 32 - 13.04 = 18.96 A → target = 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
+        h = await setup_primed_harness(hass, mock_config_entry_with_actions)
+        coordinator = h.coordinator
+        coordinator.ramp_up_time_s = 0.0  # Disable cooldown for clean transitions
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
-        assert hass.states.get(reason_id).state == REASON_POWER_METER_UPDATE
+        h.check("balancing", balancer_state=STATE_ADJUSTING, reason=REASON_POWER_METER_UPDATE)
 
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # --- Phase 2: Set max charger current to 0 A → charging stops immediately ---
         # The coordinator's early exit bypasses load balancing and outputs 0 A.
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": 0.0},
+            {"entity_id": h.ids.max_charger_current, "value": 0.0},
             blocking=True,
         )
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
-        assert hass.states.get(state_id).state == STATE_STOPPED
-        assert hass.states.get(reason_id).state == REASON_PARAMETER_CHANGE
+        h.check(
+            "max zero",
+            current_set=0.0,
+            active="off",
+            balancer_state=STATE_STOPPED,
+            reason=REASON_PARAMETER_CHANGE,
+        )
 
         # stop_charging action fires for the transition to stopped
-        stop_calls = [c for c in calls if c.data["entity_id"] == STOP_CHARGING_SCRIPT]
-        assert len(stop_calls) >= 1
+        assert script_calls.count_since(calls_before, STOP_CHARGING_SCRIPT) >= 1
 
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # --- Phase 3: Meter event while max = 0 → load balancing bypassed, output stays 0 A ---
         # Even with zero house load (full headroom), the output must remain 0 A.
         hass.states.async_set(POWER_METER, "0")
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        h.check("meter while max zero", current_set=0.0, active="off")
         assert coordinator.current_set_w == 0.0
-        assert len(calls) == 0  # No charger actions while max = 0
+        assert script_calls.count_since(calls_before) == 0  # No charger actions while max = 0
 
         # --- Phase 4: Restore max charger current to 32 A → charging resumes ---
         # Coordinator recomputes from current meter value (0 W) → target = 32 A.
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": 32.0},
+            {"entity_id": h.ids.max_charger_current, "value": 32.0},
             blocking=True,
         )
         await hass.async_block_till_done()
 
-        resumed_current = float(hass.states.get(current_set_id).state)
+        resumed_current = h.current_set()
         assert resumed_current > 0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
-        assert hass.states.get(reason_id).state == REASON_PARAMETER_CHANGE
+        h.check("max restored", active="on", balancer_state=STATE_ADJUSTING, reason=REASON_PARAMETER_CHANGE)
 
         # start_charging + set_current actions fire for the resume
-        start_calls = [c for c in calls if c.data["entity_id"] == START_CHARGING_SCRIPT]
-        set_calls = [c for c in calls if c.data["entity_id"] == SET_CURRENT_SCRIPT]
-        assert len(start_calls) >= 1
-        assert len(set_calls) >= 1
-        assert set_calls[-1].data["variables"]["current_a"] == resumed_current
+        assert script_calls.count_since(calls_before, START_CHARGING_SCRIPT) >= 1
+        assert script_calls.count_since(calls_before, SET_CURRENT_SCRIPT) >= 1
+        assert script_calls.by_script[SET_CURRENT_SCRIPT]["last"]["current_a"] == resumed_current
@@ -5,18 +5,39 @@ rather than operating at an unsafe sub-minimum current.  These tests verify
 stop/restart at the exact boundary and recovery from deep overload.
 """
 
+import pytest
 from homeassistant.core import HomeAssistant
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.ev_lb.const import DOMAIN
 from conftest import (
-    POWER_METER,
+    PRIMED_CURRENT_A,
     meter_for_available,
-    setup_integration,
-    get_entity_id,
+    setup_primed_harness,
+    state_float,
 )
 
+# Each phase: (meter reading, expected current_set, expected active,
+# expected available_current or None when not checked).  Every scenario
+# starts from the primed 18 A baseline.
+_DEEP_OVERLOAD_PHASES = [
+    # Load rises — available = 4 A < min_ev (6 A) → stop
+    (meter_for_available(4.0, PRIMED_CURRENT_A), 0.0, "off", 4.0),
+    # Deeper into overload
+    (meter_for_available(-3.0, 0.0), 0.0, "off", -3.0),
+    # Load eases to available = 6 A (exactly at min_ev) → restart
+    (meter_for_available(6.0, 0.0), 6.0, "on", None),
+    # More headroom → current increases
+    (meter_for_available(20.0, 6.0), 20.0, "on", None),
+]
+
+_ONE_AMP_BELOW_MIN_PHASES = [
+    # available = min_ev - 1 = 5 A → stop
+    (meter_for_available(5.0, PRIMED_CURRENT_A), 0.0, "off", None),
+    # available = min_ev = 6 A → restart
+    (meter_for_available(6.0, 0.0), 6.0, "on", None),
+]
+
 
 class TestStopByInsufficientHeadroom:
     """Charging stops when available < min_ev and resumes when load eases.
@@ -25,79 +46,24 @@ class TestStopByInsufficientHeadroom:
     rather than operated at an unsafe sub-minimum current.
     """
 
-    async def test_stop_when_below_min_then_resume(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
+    @pytest.mark.parametrize(
+        "phases",
+        [_DEEP_OVERLOAD_PHASES, _ONE_AMP_BELOW_MIN_PHASES],
+        ids=["deep_overload_then_resume", "one_amp_below_min_then_at_min"],
+    )
+    async def test_stop_below_min_then_resume(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+        phases: list[tuple[str, float, str, float | None]],
     ) -> None:
-        """Charger stops when headroom < min_ev and resumes once headroom is sufficient."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0  # Disable cooldown for clean transitions
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-        available_id = get_entity_id(hass, mock_config_entry, "sensor", "available_current")
-
-        # Phase 1: Start at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Phase 2: Load rises — available = 4 A < min_ev (6 A) → stop
-        hass.states.async_set(POWER_METER, meter_for_available(4.0, 18.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
-        assert float(hass.states.get(available_id).state) == 4.0
-
-        # Phase 3: Deeper into overload
-        hass.states.async_set(POWER_METER, meter_for_available(-3.0, 0.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert float(hass.states.get(available_id).state) == -3.0
-
-        # Phase 4: Load eases to available = 6 A (exactly at min_ev) → restart
-        hass.states.async_set(POWER_METER, meter_for_available(6.0, 0.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 6.0
-        assert hass.states.get(active_id).state == "on"
-
-        # Phase 5: More headroom → current increases
-        hass.states.async_set(POWER_METER, meter_for_available(20.0, 6.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 20.0
-        assert hass.states.get(active_id).state == "on"
-
-    async def test_stop_one_amp_below_min_restart_at_min(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
-    ) -> None:
-        """Available exactly one amp below min_ev stops the charger; exactly at min restarts it."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-
-        # Start charging
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        current = float(hass.states.get(current_set_id).state)
-        assert current > 0.0
-
-        # available = min_ev - 1 = 5 A → stop
-        hass.states.async_set(POWER_METER, meter_for_available(5.0, current))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        """Charger stops when headroom < min_ev and restarts once headroom reaches min_ev."""
+        h = await setup_primed_harness(hass, mock_config_entry)
+        h.coordinator.ramp_up_time_s = 0.0  # Disable cooldown for clean transitions
 
-        # available = min_ev = 6 A → restart
-        hass.states.async_set(POWER_METER, meter_for_available(6.0, 0.0))
-        await hass.async_block_till_done()
+        for watts, expected_current, expected_active, expected_available in phases:
+            await h.set_meter(watts)
 
-        assert float(hass.states.get(current_set_id).state) == 6.0
-        assert hass.states.get(active_id).state == "on"
+            h.check(f"meter {watts} W", current_set=expected_current, active=expected_active)
+            if expected_available is not None:
+                assert state_float(hass, h.ids.available_current) == expected_available, watts
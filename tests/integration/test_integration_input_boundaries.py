@@ -5,17 +5,17 @@ negative values, and extreme inputs for user-configurable parameters
 (number entities, set_limit service, power meter readings).
 """
 
+from typing import Any
+
 import pytest
 import voluptuous as vol
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ServiceValidationError
 
-from pytest_homeassistant_custom_component.common import (
-    MockConfigEntry,
-    async_mock_service,
-)
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.ev_lb import SERVICE_SET_LIMIT_SCHEMA
 from custom_components.ev_lb.const import (
     DEFAULT_MAX_CHARGER_CURRENT,
     DEFAULT_MIN_EV_CURRENT,
@@ -29,8 +29,65 @@ from custom_components.ev_lb.const import (
 from conftest import (
     POWER_METER,
     STOP_CHARGING_SCRIPT,
-    setup_integration,
-    get_entity_id,
+    ScriptCallRecorder,
+    apply_states,
+    meter_for_available,
+    setup_charging_harness,
+    setup_primed_harness,
+    state_float,
+)
+
+
+# Each case: (set_limit current_a, expected current_set, expected active).
+# Every case starts from 18 A charging at 3000 W.
+_SET_LIMIT_BOUNDARIES = (
+    # Exactly the default min EV current (6 A) → accepted and applied
+    pytest.param(DEFAULT_MIN_EV_CURRENT, DEFAULT_MIN_EV_CURRENT, "on", id="at_min_ev"),
+    # One below min EV (5 A) → stops charging
+    pytest.param(DEFAULT_MIN_EV_CURRENT - 1.0, 0.0, "off", id="one_below_min_ev"),
+    # Far above charger max (100 A) → clamped to default max (32 A)
+    pytest.param(100.0, DEFAULT_MAX_CHARGER_CURRENT, "on", id="above_charger_max"),
+)
+
+# Each case: (meter readings published in order, expected current_set,
+# expected active), with the default 32 A service at 230 V and nothing
+# charging beforehand.  Readings that sit on an available-current boundary
+# are derived once here with meter_for_available().
+_POWER_METER_BOUNDARIES = (
+    # Zero house power: available = 32 A → capped at max charger (32 A).
+    # A non-zero reading comes first so the transition to "0" fires an event.
+    pytest.param(["1000", "0"], DEFAULT_MAX_CHARGER_CURRENT, "on", id="zero_power"),
+    # Solar export of 2300 W: available = 32 + 10 = 42 A → capped at charger max (32 A)
+    pytest.param([meter_for_available(42.0, 0.0)], DEFAULT_MAX_CHARGER_CURRENT, "on", id="solar_export"),
+    # 32 A × 230 V = 7360 W → available = 0 A → below min → stop
+    pytest.param([meter_for_available(0.0, 0.0)], 0.0, "off", id="at_service_limit"),
+    # 5980 W → available = 6 A = min → charge at 6 A
+    pytest.param(
+        [meter_for_available(DEFAULT_MIN_EV_CURRENT, 0.0)], DEFAULT_MIN_EV_CURRENT, "on",
+        id="just_enough_for_min_ev",
+    ),
+    # 6210 W → available = 5 A < min (6 A) → stop
+    pytest.param(
+        [meter_for_available(DEFAULT_MIN_EV_CURRENT - 1.0, 0.0)], 0.0, "off",
+        id="just_short_of_min_ev",
+    ),
+    # 1 MW (> 200 kW safety limit) → rejected as a likely sensor error,
+    # state remains at the initial 0 A
+    pytest.param(["1000000"], 0.0, "off", id="above_safety_limit"),
+)
+
+# Each step: (max_charger_current set through the number entity, expected
+# current_set).  Applied in order to one entry charging at 3000 W, so every
+# step that charges again starts from 0 A with 18.96 A of headroom.
+_MAX_CHARGER_STEPS = (
+    # Exactly MIN_CHARGER_CURRENT (0 A) — load balancing bypassed, charging stops
+    (MIN_CHARGER_CURRENT, 0.0),
+    # Back to the default 32 A → charging resumes at 18 A
+    (DEFAULT_MAX_CHARGER_CURRENT, 18.0),
+    # 1 A < min_ev (6 A) → load balancer stops charging
+    (1.0, 0.0),
+    # Exactly MAX_CHARGER_CURRENT (80 A) → accepted; headroom still limits output
+    (MAX_CHARGER_CURRENT, 18.0),
 )
 
 
@@ -46,93 +103,40 @@ class TestMaxChargerCurrentBoundaries:
     charging immediately without running the load-balancing algorithm.
     """
 
-    async def test_set_exactly_at_minimum_limit_stops_charging(
+    async def test_max_charger_current_boundary_matrix(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
-        """Setting max charger current to exactly 0 A (minimum) stops charging immediately."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        max_id = get_entity_id(hass, mock_config_entry, "number", "max_charger_current")
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # Start charging at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Set max to exactly MIN_CHARGER_CURRENT (0 A) — load balancing bypassed, charging stops
-        await hass.services.async_call(
-            "number", "set_value",
-            {"entity_id": max_id, "value": MIN_CHARGER_CURRENT},
-            blocking=True,
-        )
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
+        """Each max charger current boundary is stored and applied in turn on one running entry.
 
-    async def test_set_to_one_amp_still_stops_below_min_ev(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """Setting max charger current to 1 A allows load balancing to run, but
-        charging stops because 1 A is below the minimum EV current of 6 A."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        max_id = get_entity_id(hass, mock_config_entry, "number", "max_charger_current")
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # Start charging at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Set max to 1 A — 1 A < min_ev (6 A) → load balancer stops charging
-        await hass.services.async_call(
-            "number", "set_value",
-            {"entity_id": max_id, "value": 1.0},
-            blocking=True,
-        )
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
-
-    async def test_set_exactly_at_maximum_limit(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """Setting max charger current to exactly 80 A (maximum) is accepted and stored."""
-        await setup_integration(hass, mock_config_entry)
-
-        max_id = get_entity_id(hass, mock_config_entry, "number", "max_charger_current")
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        0 A bypasses load balancing and stops charging, 1 A runs it but
+        stops below min EV, and the default and 80 A limits let the
+        18.96 A of headroom through as 18 A.
+        """
+        h = await setup_primed_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
-        # Set max to exactly MAX_CHARGER_CURRENT (80 A)
-        await hass.services.async_call(
-            "number", "set_value",
-            {"entity_id": max_id, "value": MAX_CHARGER_CURRENT},
-            blocking=True,
-        )
-        await hass.async_block_till_done()
+        for value, expected_current in _MAX_CHARGER_STEPS:
+            await hass.services.async_call(
+                "number", "set_value",
+                {"entity_id": h.ids.max_charger_current, "value": value},
+                blocking=True,
+            )
+            await hass.async_block_till_done()
 
-        # Entity and coordinator should both reflect 80 A
-        assert float(hass.states.get(max_id).state) == MAX_CHARGER_CURRENT
-        assert coordinator.max_charger_current == MAX_CHARGER_CURRENT
+            assert state_float(hass, h.ids.max_charger_current) == value, value
+            assert h.coordinator.max_charger_current == value, value
+            assert h.current_set() == expected_current, value
 
     async def test_set_one_above_maximum_is_rejected(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """Setting max charger current above 80 A is rejected by HA validation."""
-        await setup_integration(hass, mock_config_entry)
-
-        max_id = get_entity_id(hass, mock_config_entry, "number", "max_charger_current")
+        h = await setup_charging_harness(hass, mock_config_entry)
 
         # HA's number entity rejects values outside [min, max] range
         with pytest.raises(ServiceValidationError):
             await hass.services.async_call(
                 "number", "set_value",
-                {"entity_id": max_id, "value": MAX_CHARGER_CURRENT + 1},
+                {"entity_id": h.ids.max_charger_current, "value": MAX_CHARGER_CURRENT + 1},
                 blocking=True,
             )
 
@@ -140,29 +144,22 @@ class TestMaxChargerCurrentBoundaries:
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """When max charger current is 0, subsequent power meter updates also output 0 A."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        max_id = get_entity_id(hass, mock_config_entry, "number", "max_charger_current")
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Set max to 0 A
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": 0.0},
+            {"entity_id": h.ids.max_charger_current, "value": 0.0},
             blocking=True,
         )
-        await hass.async_block_till_done()
 
         # Even with zero house load (which would normally allow full charging),
         # the output must stay 0 A because max charger current is 0
-        hass.states.async_set(POWER_METER, "0")
-        await hass.async_block_till_done()
+        await h.set_meter("0")
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert coordinator.current_set_a == 0.0
-        assert coordinator.current_set_w == 0.0
+        assert h.current_set() == 0.0
+        assert h.coordinator.current_set_a == 0.0
+        assert h.coordinator.current_set_w == 0.0
 
 
 class TestMinEvCurrentBoundaries:
@@ -176,31 +173,24 @@ class TestMinEvCurrentBoundaries:
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """Setting min EV current to exactly 1 A (minimum) allows charging at very low headroom."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        min_id = get_entity_id(hass, mock_config_entry, "number", "min_ev_current")
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # First, create a scenario where the charger stops with default min (6 A):
         # 7130 W → available = 32 - 31 = 1 A → raw_target = 0 + 1 = 1 < 6 → stop
-        hass.states.async_set(POWER_METER, "7130")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 0.0
+        await h.set_meter("7130")
+        assert h.current_set() == 0.0
 
         # Now lower min to 1 A → recompute with meter=7130 → available=1,
         # raw_target=0+1=1, clamped=1, 1≥1 → charge at 1 A
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": min_id, "value": MIN_EV_CURRENT_MIN},
+            {"entity_id": h.ids.min_ev_current, "value": MIN_EV_CURRENT_MIN},
             blocking=True,
         )
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 1.0
-        assert hass.states.get(active_id).state == "on"
+        assert h.current_set() == 1.0
+        assert hass.states.get(h.ids.active).state == "on"
 
     async def test_set_exactly_at_maximum_limit(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
@@ -210,44 +200,35 @@ class TestMinEvCurrentBoundaries:
         Charges at 32 A with no house load; stops when additional load pushes
         available current below the minimum.
         """
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        min_id = get_entity_id(hass, mock_config_entry, "number", "min_ev_current")
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Set min to 32 A: meter is already at 0 W from setup, triggering async_recompute_from_current_state.
         # service=0 A, ev_estimate=0 (current_set=0), non_ev=0, available=32 A ≥ min_ev=32 A → charge at 32 A
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": min_id, "value": MIN_EV_CURRENT_MAX},
+            {"entity_id": h.ids.min_ev_current, "value": MIN_EV_CURRENT_MAX},
             blocking=True,
         )
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 32.0
+        assert h.current_set() == 32.0
 
         # Increase load to 8000 W → service=34.78 A > current_set=32 A → non_ev=2.78 A,
         # available=29.22 A → floor=29 A < min_ev=32 A → stop
-        hass.states.async_set(POWER_METER, "8000")
-        await hass.async_block_till_done()
+        await h.set_meter("8000")
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        assert h.current_set() == 0.0
+        assert hass.states.get(h.ids.active).state == "off"
 
     async def test_one_above_maximum_is_rejected(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """Setting min EV current above 32 A is rejected by HA validation."""
-        await setup_integration(hass, mock_config_entry)
-
-        min_id = get_entity_id(hass, mock_config_entry, "number", "min_ev_current")
+        h = await setup_charging_harness(hass, mock_config_entry)
 
         with pytest.raises(ServiceValidationError):
             await hass.services.async_call(
                 "number", "set_value",
-                {"entity_id": min_id, "value": MIN_EV_CURRENT_MAX + 1},
+                {"entity_id": h.ids.min_ev_current, "value": MIN_EV_CURRENT_MAX + 1},
                 blocking=True,
             )
 
@@ -268,22 +249,12 @@ class TestSetLimitBoundaryValues:
         self,
         hass: HomeAssistant,
         mock_config_entry_with_actions: MockConfigEntry,
+        script_calls: ScriptCallRecorder,
     ) -> None:
         """Setting limit to exactly 0 A stops charging (below min EV current)."""
-        calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
+        h = await setup_primed_harness(hass, mock_config_entry_with_actions, ramp_up_time_s=0.0)
 
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
-
-        # Start charging at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # Set limit to 0 A → below min → stop
         await hass.services.async_call(
@@ -291,110 +262,52 @@ class TestSetLimitBoundaryValues:
         )
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
-        stop_calls = [c for c in calls if c.data["entity_id"] == STOP_CHARGING_SCRIPT]
-        assert len(stop_calls) >= 1
-
-    async def test_set_limit_exactly_at_min_ev_current(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """Setting limit to exactly 6 A (default min EV current) is accepted and applied."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-
-        # Start charging
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        # Set limit to exactly min EV current (6 A)
-        await hass.services.async_call(
-            DOMAIN, SERVICE_SET_LIMIT,
-            {"current_a": DEFAULT_MIN_EV_CURRENT},
-            blocking=True,
-        )
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MIN_EV_CURRENT
-        assert hass.states.get(active_id).state == "on"
-
-    async def test_set_limit_one_below_min_ev_stops(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """Setting limit to 5 A (one below default min EV 6 A) stops charging."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
+        assert h.current_set() == 0.0
+        assert hass.states.get(h.ids.active).state == "off"
+        assert script_calls.count_since(calls_before, STOP_CHARGING_SCRIPT) >= 1
 
-        # Start charging
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        # Set limit to one below min
-        await hass.services.async_call(
-            DOMAIN, SERVICE_SET_LIMIT,
-            {"current_a": DEFAULT_MIN_EV_CURRENT - 1.0},
-            blocking=True,
-        )
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
-
-    async def test_set_limit_above_charger_max_is_clamped(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
+    @pytest.mark.parametrize(
+        ("current_a", "expected_current", "expected_active"), _SET_LIMIT_BOUNDARIES,
+    )
+    async def test_set_limit_boundary(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+        current_a: float,
+        expected_current: float,
+        expected_active: str,
     ) -> None:
-        """Setting limit to 100 A (above charger max 32 A) is clamped to 32 A."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
+        """A set_limit value at or around the min EV / charger max limits is applied, stopped, or clamped."""
+        h = await setup_primed_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
-        # Start charging
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        # Set limit far above max charger current
         await hass.services.async_call(
-            DOMAIN, SERVICE_SET_LIMIT, {"current_a": 100.0}, blocking=True,
+            DOMAIN, SERVICE_SET_LIMIT, {"current_a": current_a}, blocking=True,
         )
         await hass.async_block_till_done()
 
-        # Clamped to default max charger current (32 A)
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MAX_CHARGER_CURRENT
-
-    async def test_set_limit_negative_is_rejected(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """Negative current_a is rejected by the service schema validation."""
-        await setup_integration(hass, mock_config_entry)
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # Start charging
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        before = float(hass.states.get(current_set_id).state)
-
-        # Negative value should raise a validation error
+        assert h.current_set() == expected_current
+        assert hass.states.get(h.ids.active).state == expected_active
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"current_a": -5.0},
+            {"current_a": -0.1},
+            {"current_a": "abc"},
+            {},
+            {"current_a": 16.0, "entry_id": 5},
+            {"current_a": 16.0, "unknown": True},
+        ],
+        ids=["negative", "just_below_zero", "non_numeric", "missing", "bad_entry_id", "extra_key"],
+    )
+    def test_set_limit_invalid_payload_is_rejected(self, payload: dict[str, Any]) -> None:
+        """Negative, non-numeric, missing or unexpected set_limit fields are rejected by the service schema.
+
+        The schema alone decides this, so it is checked without setting up
+        the integration; a rejected call never reaches the handler.
+        """
         with pytest.raises(vol.MultipleInvalid):
-            await hass.services.async_call(
-                DOMAIN, SERVICE_SET_LIMIT,
-                {"current_a": -5.0},
-                blocking=True,
-            )
-        await hass.async_block_till_done()
-
-        # State should remain unchanged
-        assert float(hass.states.get(current_set_id).state) == before
+            SERVICE_SET_LIMIT_SCHEMA(payload)
 
 
 # ---------------------------------------------------------------------------
@@ -409,132 +322,32 @@ class TestPowerMeterBoundaryValues:
     and extreme values that push available current beyond limits.
     """
 
-    async def test_zero_power_gives_max_available(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """Zero house power gives full service capacity to the charger (capped at max)."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # First set a non-zero value so the transition to "0" fires an event
-        hass.states.async_set(POWER_METER, "1000")
-        await hass.async_block_till_done()
-
-        hass.states.async_set(POWER_METER, "0")
-        await hass.async_block_till_done()
-
-        # available = 32 - 0/230 = 32 A → capped at max charger (32 A)
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MAX_CHARGER_CURRENT
-
-    async def test_negative_power_solar_export(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """Negative power (solar export) gives more than service capacity but is capped at charger max."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # Negative power: exporting 2300 W → available = 32 + 10 = 42 A
-        # But capped at charger max (32 A)
-        hass.states.async_set(POWER_METER, "-2300")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MAX_CHARGER_CURRENT
-
-    async def test_power_exactly_at_service_limit(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """House load exactly at service limit leaves zero available — charging stops."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-
-        # 32 A × 230 V = 7360 W → available = 32 - 32 = 0 A → below min → stop
-        hass.states.async_set(POWER_METER, "7360")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
-
-    async def test_power_one_watt_below_stopping_threshold(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """House load just below the point where min EV current (6 A) is available — charger operates at minimum."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-
-        # For 6 A available: 32 - P/230 ≥ 6 → P ≤ 5980 W
-        # 5980 W → available = 32 - (5980/230) = 32 - 26 = 6 A = min → charge at 6 A
-        hass.states.async_set(POWER_METER, "5980")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MIN_EV_CURRENT
-        assert hass.states.get(active_id).state == "on"
-
-    async def test_power_one_watt_above_stopping_threshold(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
+    @pytest.mark.parametrize(
+        ("readings", "expected_current", "expected_active"), _POWER_METER_BOUNDARIES,
+    )
+    async def test_power_meter_boundary(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+        readings: list[str],
+        expected_current: float,
+        expected_active: str,
     ) -> None:
-        """House load just above the point where min EV is unavailable — charging stops."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
+        """Meter readings at the zero, export, service-limit, min-EV and safety-limit boundaries set the output."""
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
+        await apply_states(hass, [(POWER_METER, watts) for watts in readings])
 
-        # 6210 W → available = 32 - (6210/230) = 32 - 27 = 5 A < min (6 A) → stop
-        hass.states.async_set(POWER_METER, "6210")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        assert h.current_set() == expected_current
+        assert hass.states.get(h.ids.active).state == expected_active
 
     async def test_non_numeric_meter_value_is_ignored(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """A non-numeric meter value (e.g. 'abc') is silently ignored without crashing."""
-        await setup_integration(hass, mock_config_entry)
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # Start charging at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        h = await setup_primed_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Send garbage value → should be ignored, state unchanged
-        hass.states.async_set(POWER_METER, "abc")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-    async def test_extremely_large_power_value(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
-    ) -> None:
-        """An extremely large power value (1 MW) is rejected by the safety guardrail."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-
-        # 1 MW (> 200 kW safety limit) → rejected as likely sensor error
-        # State remains at initial 0.0 A
-        hass.states.async_set(POWER_METER, "1000000")
-        await hass.async_block_till_done()
+        await h.set_meter("abc")
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        assert h.current_set() == 18.0
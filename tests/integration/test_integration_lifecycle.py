@@ -6,13 +6,15 @@ config entry disable/enable, and options flow updates that modify
 behavior during active operation.
 """
 
+from collections.abc import Awaitable, Callable
+
+import pytest
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import entity_registry as er
 
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
-    async_mock_service,
     mock_restore_cache_with_extra_data,
 )
 
@@ -28,8 +30,10 @@ from conftest import (
     SET_CURRENT_SCRIPT,
     STOP_CHARGING_SCRIPT,
     START_CHARGING_SCRIPT,
+    ScriptCallRecorder,
     setup_integration,
     get_entity_id,
+    get_entity_ids,
 )
 
 # Entity ID for restore cache (deterministic from device name + translation key)
@@ -64,29 +68,21 @@ class TestFullLifecycleSetupToUnload:
         assert "coordinator" in hass.data[DOMAIN][entry_id]
 
         # Verify all entity platforms loaded
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        available_id = get_entity_id(hass, mock_config_entry, "sensor", "available_current")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-        meter_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "meter_status")
-        max_id = get_entity_id(hass, mock_config_entry, "number", "max_charger_current")
-        switch_id = get_entity_id(hass, mock_config_entry, "switch", "enabled")
-        assert all(
-            hass.states.get(eid) is not None
-            for eid in [current_set_id, available_id, active_id, meter_id, max_id, switch_id]
-        )
+        ids = get_entity_ids(hass, mock_config_entry)
+        assert not set(ids) - set(hass.states.async_entity_ids())
 
         # Operate: set a meter value and verify state updates
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(ids.current_set).state) == 18.0
 
         # Use set_limit service to verify it works
         await hass.services.async_call(
             DOMAIN, SERVICE_SET_LIMIT, {"current_a": 16.0}, blocking=True
         )
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 16.0
+        assert float(hass.states.get(ids.current_set).state) == 16.0
 
         # Unload
         await hass.config_entries.async_unload(entry_id)
@@ -114,9 +110,9 @@ class TestOptionsFlowDuringOperation:
         self,
         hass: HomeAssistant,
         mock_config_entry_no_actions: MockConfigEntry,
+        script_calls: ScriptCallRecorder,
     ) -> None:
         """Adding action scripts via options flow makes them fire on the next state transition."""
-        calls = async_mock_service(hass, "script", "turn_on")
         await setup_integration(hass, mock_config_entry_no_actions)
 
         current_set_id = get_entity_id(hass, mock_config_entry_no_actions, "sensor", "current_set")
@@ -126,7 +122,7 @@ class TestOptionsFlowDuringOperation:
         await hass.async_block_till_done()
 
         assert float(hass.states.get(current_set_id).state) == 18.0
-        assert len(calls) == 0
+        assert script_calls.count == 0
 
         # Phase 2: Add action scripts via options flow
         result = await hass.config_entries.options.async_init(
@@ -142,10 +138,11 @@ class TestOptionsFlowDuringOperation:
         )
         assert result["type"] == "create_entry"
 
-        calls.clear()
+        calls_before = script_calls.checkpoint()
 
         # Phase 3: Next meter event should now fire actions
-        # Change meter to trigger a state transition
+        # Change meter to trigger a state transition.  Full drain: the
+        # options update reloads the entry in a task that may still be pending.
         hass.states.async_set(POWER_METER, "5000")
         await hass.async_block_till_done()
 
@@ -153,74 +150,103 @@ class TestOptionsFlowDuringOperation:
         assert new_current > 0
 
         # Actions should now fire since we added them via options
-        set_calls = [c for c in calls if c.data["entity_id"] == SET_CURRENT_SCRIPT]
-        assert len(set_calls) >= 1
+        assert script_calls.count_since(calls_before, SET_CURRENT_SCRIPT) >= 1
 
 
 # ---------------------------------------------------------------------------
-# Scenario: HA restart with state restoration
+# Scenario: HA restart, config entry disable/enable, and integration reload
 # ---------------------------------------------------------------------------
 
 
-class TestHaRestartWithStateRestoration:
-    """Simulate a Home Assistant restart during active charging.
+async def _unload_then_setup(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Unload *entry*, check it cleaned up, then set it up again.
 
-    Verifies that after unloading (HA stop) and reloading (HA start),
-    entity states are restored and the integration resumes normal
-    operation from the restored values.
+    HA restart and disabling then re-enabling the config entry both do this
+    to a running entry.  The meter keeps its last state throughout, and on
+    setup HA's entity framework restores entity states from the registry
+    cache before the next meter reading.
     """
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert not hass.services.has_service(DOMAIN, SERVICE_SET_LIMIT)
+    assert entry.entry_id not in hass.data.get(DOMAIN, {})
 
-    async def test_restart_restores_state_and_resumes_operation(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
-    ) -> None:
-        """Charging current and entity states survive an HA restart and the integration resumes from restored values."""
-        # --- Phase 1: Initial setup and normal operation ---
-        await setup_integration(hass, mock_config_entry)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
 
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-        switch_id = get_entity_id(hass, mock_config_entry, "switch", "enabled")
 
-        # Charge at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
+async def _reload(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Unload and set up *entry* in one call, as the UI "Reload" button does."""
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
-        assert hass.states.get(active_id).state == "on"
-        assert hass.states.get(switch_id).state == "on"
 
-        # --- Phase 2: Unload (simulates HA stopping) ---
-        await hass.config_entries.async_unload(mock_config_entry.entry_id)
-        await hass.async_block_till_done()
+class TestUnloadAndSetupAgain:
+    """Take a charging entry out of service and back, then verify it resumes.
 
-        assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+    HA restart, disabling and re-enabling the config entry, and the UI
+    reload all unload the entry and set it up again in a running HA.  Each
+    must unregister services and clean up on the way out, and bring back
+    the same entities, the set_limit service and normal balancing.
+    """
 
-        # --- Phase 3: Reload (simulates HA starting) ---
-        # HA's entity framework auto-restores entity states from the
-        # entity registry cache, so current_set_a and other values
-        # survive the restart automatically.
+    @pytest.mark.parametrize(
+        "take_out_and_back",
+        [
+            # HA restart and disabling then re-enabling the entry take this path
+            pytest.param(_unload_then_setup, id="unload_setup"),
+            pytest.param(_reload, id="reload"),
+        ],
+    )
+    async def test_unload_and_setup_again_resumes_operation(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+        take_out_and_back: Callable[[HomeAssistant, MockConfigEntry], Awaitable[None]],
+    ) -> None:
+        """Entities, services and balancing all come back after the entry is unloaded and set up again."""
+        await setup_integration(hass, mock_config_entry)
+        ent_reg = er.async_get(hass)
+        count_before = len(er.async_entries_for_config_entry(ent_reg, mock_config_entry.entry_id))
+
+        ids = get_entity_ids(hass, mock_config_entry)
+
+        # Phase 1: Normal operation at 18 A
         hass.states.async_set(POWER_METER, "3000")
-        await hass.config_entries.async_setup(mock_config_entry.entry_id)
         await hass.async_block_till_done()
 
-        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert float(hass.states.get(ids.current_set).state) == 18.0
+        assert hass.states.get(ids.active).state == "on"
+        assert hass.states.get(ids.enabled).state == "on"
 
-        # Verify coordinator is functional after restart
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        assert coordinator.enabled is True
+        # Phase 2: Out of service and back
+        await take_out_and_back(hass, mock_config_entry)
 
-        # Verify entities have live states (not "unavailable")
-        assert hass.states.get(current_set_id).state != "unavailable"
-        assert hass.states.get(switch_id).state == "on"
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert hass.services.has_service(DOMAIN, SERVICE_SET_LIMIT)
+        assert mock_config_entry.entry_id in hass.data[DOMAIN]
 
-        # --- Phase 4: Resume operation after restart ---
-        # A new meter event triggers normal balancing with the restored state
+        # Phase 3: Same entities, live again, coordinator enabled
+        assert len(er.async_entries_for_config_entry(ent_reg, mock_config_entry.entry_id)) == count_before
+        assert not set(ids) - set(hass.states.async_entity_ids())
+        assert hass.states.get(ids.current_set).state != "unavailable"
+        assert hass.states.get(ids.enabled).state == "on"
+        assert hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"].enabled is True
+
+        # Phase 4: A new meter event triggers normal balancing
         hass.states.async_set(POWER_METER, "5000")
         await hass.async_block_till_done()
 
-        new_current = float(hass.states.get(current_set_id).state)
-        assert new_current > 0
-        assert hass.states.get(active_id).state == "on"
+        assert float(hass.states.get(ids.current_set).state) > 0
+        assert hass.states.get(ids.active).state == "on"
+
+        # The set_limit service works again
+        await hass.services.async_call(
+            DOMAIN, SERVICE_SET_LIMIT, {"current_a": 12.0}, blocking=True
+        )
+        await hass.async_block_till_done()
+        assert float(hass.states.get(ids.current_set).state) == 12.0
 
 
 # ---------------------------------------------------------------------------
@@ -240,7 +266,10 @@ class TestHaRestartWithRestoreCache:
     ) -> None:
         """Coordinator ignores restored current_set cache and starts at zero for a safe startup."""
         # Set up restore cache BEFORE first setup (simulating HA start with
-        # cached state from a previous HA session)
+        # cached state from a previous HA session).  The cache must really
+        # hold 16 A: the safe-start guarantee is that a restored non-zero
+        # current is ignored, which an empty or patched-out cache cannot show.
+        # It is written straight into RestoreStateData, so no store is read.
         mock_restore_cache_with_extra_data(
             hass,
             [
@@ -268,128 +297,3 @@ class TestHaRestartWithRestoreCache:
 
         new_current = float(hass.states.get(current_set_id).state)
         assert new_current > 0
-
-
-# ---------------------------------------------------------------------------
-# Scenario: Config entry disable/enable
-# ---------------------------------------------------------------------------
-
-
-class TestConfigEntryDisableEnable:
-    """Simulate disabling and re-enabling the config entry.
-
-    In Home Assistant, users can disable integrations from the config
-    entry UI. This unloads the entry. Re-enabling calls setup again.
-    """
-
-    async def test_disable_unloads_and_enable_restores_operation(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
-    ) -> None:
-        """Disabling the config entry unloads cleanly, and re-enabling restores full operation."""
-        await setup_integration(hass, mock_config_entry)
-        entry_id = mock_config_entry.entry_id
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # Phase 1: Normal operation
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Phase 2: Disable (unload) the config entry
-        await hass.config_entries.async_unload(entry_id)
-        await hass.async_block_till_done()
-
-        assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
-        assert not hass.services.has_service(DOMAIN, SERVICE_SET_LIMIT)
-        assert entry_id not in hass.data.get(DOMAIN, {})
-
-        # Phase 3: Re-enable (setup) the config entry
-        await hass.config_entries.async_setup(entry_id)
-        await hass.async_block_till_done()
-
-        assert mock_config_entry.state is ConfigEntryState.LOADED
-        assert hass.services.has_service(DOMAIN, SERVICE_SET_LIMIT)
-        assert entry_id in hass.data[DOMAIN]
-
-        # Verify all entity platforms loaded again
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-        switch_id = get_entity_id(hass, mock_config_entry, "switch", "enabled")
-        assert all(
-            hass.states.get(eid) is not None
-            for eid in [current_set_id, active_id, switch_id]
-        )
-
-        # Phase 4: Verify operation resumes after re-enable
-        hass.states.async_set(POWER_METER, "5000")
-        await hass.async_block_till_done()
-
-        resumed_current = float(hass.states.get(current_set_id).state)
-        assert resumed_current > 0
-        assert hass.states.get(active_id).state == "on"
-
-
-# ---------------------------------------------------------------------------
-# Scenario: Integration reload preserves functionality
-# ---------------------------------------------------------------------------
-
-
-class TestIntegrationReload:
-    """Verify the integration reloads cleanly and resumes operation.
-
-    When a user triggers a reload (e.g., via the UI "Reload" button),
-    the integration unloads and sets up again. All entities and services
-    must come back and work correctly.
-    """
-
-    async def test_reload_preserves_entity_count_and_operation(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
-    ) -> None:
-        """Integration reload keeps all entities and resumes normal operation."""
-        await setup_integration(hass, mock_config_entry)
-        entry_id = mock_config_entry.entry_id
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-
-        # Phase 1: Operate before reload
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Count entities before reload
-        ent_reg = er.async_get(hass)
-        entries_before = er.async_entries_for_config_entry(ent_reg, entry_id)
-        count_before = len(entries_before)
-
-        # Phase 2: Reload (unload + setup)
-        await hass.config_entries.async_unload(entry_id)
-        await hass.async_block_till_done()
-        assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
-
-        await hass.config_entries.async_setup(entry_id)
-        await hass.async_block_till_done()
-        assert mock_config_entry.state is ConfigEntryState.LOADED
-
-        # Phase 3: Verify same entity count after reload
-        entries_after = er.async_entries_for_config_entry(ent_reg, entry_id)
-        assert len(entries_after) == count_before
-
-        # Phase 4: Verify operation resumes
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
-
-        hass.states.async_set(POWER_METER, "5000")
-        await hass.async_block_till_done()
-
-        resumed_current = float(hass.states.get(current_set_id).state)
-        assert resumed_current > 0
-        assert hass.states.get(active_id).state == "on"
-
-        # Service should still work
-        await hass.services.async_call(
-            DOMAIN, SERVICE_SET_LIMIT, {"current_a": 12.0}, blocking=True
-        )
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 12.0
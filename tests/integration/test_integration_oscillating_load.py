@@ -8,6 +8,11 @@ Covers:
 - Oscillating load that always stays above min_ev never stops the charger
 """
 
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.core import HomeAssistant
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
@@ -22,12 +27,72 @@ from custom_components.ev_lb.const import (
 )
 from conftest import (
     POWER_METER,
+    ChargingHarness,
     meter_for_available,
-    setup_integration,
-    get_entity_id,
+    setup_charging_harness,
 )
 
 
+async def _push_meter(h: ChargingHarness, watts: str, phase: str, **expected: Any) -> None:
+    """Publish a meter reading, let HA settle, and check *expected* states.
+
+    *expected* takes the :meth:`ChargingHarness.check` fields (``current_set``,
+    ``active``, ``balancer_state``, ``reason``).
+    """
+    await h.set_meter(watts)
+    h.check(phase, **expected)
+
+
+# Each phase: (seconds since the previous phase, meter reading, phase
+# label, expected ChargingHarness.check fields).  The last phase of each
+# table is the release after the cooldown; tests check the increase
+# separately.
+_BRIEF_SPIKE_PHASES = [
+    # Start charging at 18 A (3000 W)
+    (0, "3000", "start", {"current_set": 18.0}),
+    # Spike — available drops to 10 A → reduce to 10 A
+    (10, meter_for_available(10.0, 18.0), "spike", {"current_set": 10.0, "balancer_state": STATE_ADJUSTING}),
+    # Spike clears — available = 25 A, but 1 s since reduction → held (ramp_up_hold)
+    (1, meter_for_available(25.0, 10.0), "clear", {"current_set": 10.0, "balancer_state": STATE_RAMP_UP_HOLD}),
+    # Still within cooldown 20 s after the reduction — still held
+    (19, meter_for_available(25.01, 10.0), "held", {"current_set": 10.0, "balancer_state": STATE_RAMP_UP_HOLD}),
+    # Cooldown expires 31 s after the reduction → increase allowed
+    (11, meter_for_available(25.02, 10.0), "expired", {"balancer_state": STATE_ADJUSTING}),
+]
+
+_TWO_SPIKES_PHASES = [
+    # Start at 18 A
+    (0, "3000", "start", {"current_set": 18.0}),
+    # First spike → reduce to 14 A
+    (10, meter_for_available(14.0, 18.0), "spike 1", {"current_set": 14.0}),
+    # Load eases 25 s after the first spike (within 30 s cooldown) → increase blocked
+    (25, meter_for_available(25.0, 14.0), "ease 1", {"current_set": 14.0, "balancer_state": STATE_RAMP_UP_HOLD}),
+    # Second spike 28 s after the first → reduce to 10 A → RESETS the timer
+    (3, meter_for_available(10.0, 14.0), "spike 2", {"current_set": 10.0}),
+    # 50 s from the first spike, but only 22 s from the second → still blocked
+    (22, meter_for_available(25.0, 10.0), "ease 2", {"current_set": 10.0, "balancer_state": STATE_RAMP_UP_HOLD}),
+    # 31 s from the second spike → now allowed
+    (9, meter_for_available(25.01, 10.0), "expired", {"balancer_state": STATE_ADJUSTING}),
+]
+
+# Runs with max_charger_current = 24 A.
+_OSCILLATION_PHASES = [
+    # Start at 24 A (max_charger); setup_integration sets the meter to "0",
+    # so use "100" to fire a distinct event
+    (0, "100", "start", {"current_set": 24.0}),
+    # First oscillation up — available=17 A → reduce to 17 A
+    (10, meter_for_available(17.0, 24.0), "up 1", {"current_set": 17.0, "balancer_state": STATE_ADJUSTING}),
+    # Oscillation down — would increase, but blocked (5 s < 30 s)
+    (5, meter_for_available(24.0, 17.0), "down 1", {"current_set": 17.0, "balancer_state": STATE_RAMP_UP_HOLD}),
+    # Second oscillation up — available=14 A → reduce to 14 A (resets timer)
+    (10, meter_for_available(14.0, 17.0), "up 2", {"current_set": 14.0, "balancer_state": STATE_ADJUSTING}),
+    # Oscillation down — would increase, but blocked (5 s from the last reduction)
+    (5, meter_for_available(24.0, 14.0), "down 2", {"current_set": 14.0, "balancer_state": STATE_RAMP_UP_HOLD}),
+    # Load stays low for 31 s from the last reduction → allowed
+    (26, meter_for_available(24.01, 14.0), "stable", {"balancer_state": STATE_ADJUSTING}),
+]
+
+
 # ---------------------------------------------------------------------------
 # Transient load spike
 # ---------------------------------------------------------------------------
@@ -42,122 +107,27 @@ class TestTransientLoadSpike:
     (30 s by default) can the current increase again.
     """
 
-    async def test_brief_spike_reduces_then_ramp_up_holds_recovery(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
+    @pytest.mark.parametrize(
+        "phases",
+        [_BRIEF_SPIKE_PHASES, _TWO_SPIKES_PHASES],
+        ids=["brief_spike_then_ramp_up_hold", "two_spikes_each_reset_timer"],
+    )
+    async def test_spike_reduces_then_ramp_up_holds_recovery(
+        self,
+        hass: HomeAssistant,
+        mock_config_entry: MockConfigEntry,
+        phases: list[tuple[int, str, str, dict[str, Any]]],
+        freezer: FrozenDateTimeFactory,
     ) -> None:
-        """Brief spike causes reduction; charger is held at reduced current until cooldown expires."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 30.0
-
-        mock_time = 1000.0
-
-        def fake_monotonic():
-            return mock_time
-
-        coordinator._time_fn = fake_monotonic
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        state_id = get_entity_id(hass, mock_config_entry, "sensor", "balancer_state")
-
-        # Phase 1: Start charging at 18 A (3000 W)
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Phase 2: Spike — available drops to 10 A → reduce to 10 A
-        mock_time = 1010.0
-        hass.states.async_set(POWER_METER, meter_for_available(10.0, 18.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 10.0
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
-
-        # Phase 3: Spike clears — available = 25 A, but 1 s since reduction → held
-        # Charger is running at 10 A (active) and an increase is blocked → ramp_up_hold
-        mock_time = 1011.0
-        hass.states.async_set(POWER_METER, meter_for_available(25.0, 10.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 10.0
-        assert hass.states.get(state_id).state == STATE_RAMP_UP_HOLD
-
-        # Phase 4: Still within cooldown at 20 s — still held
-        mock_time = 1030.0
-        hass.states.async_set(POWER_METER, meter_for_available(25.01, 10.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 10.0
-        assert hass.states.get(state_id).state == STATE_RAMP_UP_HOLD
-
-        # Phase 5: Cooldown expires at 31 s → increase allowed
-        mock_time = 1041.0  # 31 s after T=1010
-        hass.states.async_set(POWER_METER, meter_for_available(25.02, 10.0))
-        await hass.async_block_till_done()
-
-        final_current = float(hass.states.get(current_set_id).state)
-        assert final_current > 10.0  # Increased after cooldown
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
-
-    async def test_two_consecutive_spikes_each_reset_ramp_up_timer(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
-    ) -> None:
-        """Each new reduction resets the ramp-up timer; the hold is measured from the last reduction."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 30.0
-
-        mock_time = 1000.0
-
-        def fake_monotonic():
-            return mock_time
-
-        coordinator._time_fn = fake_monotonic
+        """Each reduction restarts the ramp-up hold; the current only rises once the last one is 30 s old."""
+        h = await setup_charging_harness(hass, mock_config_entry)
+        h.coordinator.ramp_up_time_s = 30.0
 
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        state_id = get_entity_id(hass, mock_config_entry, "sensor", "balancer_state")
+        for elapsed_s, watts, phase, expected in phases:
+            freezer.tick(timedelta(seconds=elapsed_s))
+            await _push_meter(h, watts, phase, **expected)
 
-        # Phase 1: Start at 18 A
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
-
-        # Phase 2: First spike at T=1010 → reduce to 14 A
-        mock_time = 1010.0
-        hass.states.async_set(POWER_METER, meter_for_available(14.0, 18.0))
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 14.0
-
-        # Phase 3: Load eases at T=1035 (25 s from first spike) → increase blocked
-        mock_time = 1035.0  # 25 s from T=1010 — within 30 s cooldown
-        hass.states.async_set(POWER_METER, meter_for_available(25.0, 14.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 14.0
-        assert hass.states.get(state_id).state == STATE_RAMP_UP_HOLD
-
-        # Phase 4: Second spike at T=1038 → reduce to 10 A → RESETS timer to T=1038
-        mock_time = 1038.0
-        hass.states.async_set(POWER_METER, meter_for_available(10.0, 14.0))
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 10.0
-
-        # Phase 5: At T=1060 (50 s from first spike, but only 22 s from second) → still blocked
-        mock_time = 1060.0
-        hass.states.async_set(POWER_METER, meter_for_available(25.0, 10.0))
-        await hass.async_block_till_done()
-
-        assert float(hass.states.get(current_set_id).state) == 10.0
-        assert hass.states.get(state_id).state == STATE_RAMP_UP_HOLD  # timer reset to T=1038
-
-        # Phase 6: At T=1069 (31 s from second spike) → now allowed
-        mock_time = 1069.0
-        hass.states.async_set(POWER_METER, meter_for_available(25.01, 10.0))
-        await hass.async_block_till_done()
-
-        final_current = float(hass.states.get(current_set_id).state)
-        assert final_current > 10.0
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
+        assert h.current_set() > 10.0  # Increased above the 10 A hold after cooldown
 
 
 # ---------------------------------------------------------------------------
@@ -174,8 +144,9 @@ class TestOscillatingLoad:
     further reductions.
     """
 
+    @pytest.mark.slow
     async def test_repeated_oscillations_then_stable_recovery(
-        self, hass: HomeAssistant
+        self, hass: HomeAssistant, freezer: FrozenDateTimeFactory
     ) -> None:
         """Repeated reductions keep resetting the timer; increase only allowed after stable period."""
         entry = MockConfigEntry(
@@ -187,101 +158,36 @@ class TestOscillatingLoad:
             },
             title="EV Oscillation",
         )
-        await setup_integration(hass, entry)
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 30.0
-        coordinator.max_charger_current = 24.0
-
-        mock_time = 1000.0
-
-        def fake_monotonic():
-            return mock_time
-
-        coordinator._time_fn = fake_monotonic
+        h = await setup_charging_harness(hass, entry)
+        h.coordinator.ramp_up_time_s = 30.0
+        h.coordinator.max_charger_current = 24.0
 
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        state_id = get_entity_id(hass, entry, "sensor", "balancer_state")
+        for elapsed_s, watts, phase, expected in _OSCILLATION_PHASES:
+            freezer.tick(timedelta(seconds=elapsed_s))
+            await _push_meter(h, watts, phase, **expected)
 
-        # Phase 1: Start at 24 A (max_charger)
-        # setup_integration sets meter to "0"; use "100" to fire a distinct event
-        mock_time = 1000.0
-        hass.states.async_set(POWER_METER, "100")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 24.0
-
-        # Phase 2: First oscillation up — T=1010, available=17 A → reduce to 17 A
-        mock_time = 1010.0
-        hass.states.async_set(POWER_METER, meter_for_available(17.0, 24.0))
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 17.0
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
-
-        # Phase 3: Oscillation down — T=1015, would increase, but blocked (5 s < 30 s)
-        mock_time = 1015.0
-        hass.states.async_set(POWER_METER, meter_for_available(24.0, 17.0))
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 17.0
-        assert hass.states.get(state_id).state == STATE_RAMP_UP_HOLD
-
-        # Phase 4: Second oscillation up — T=1025, available=14 A → reduce to 14 A (resets timer)
-        mock_time = 1025.0
-        hass.states.async_set(POWER_METER, meter_for_available(14.0, 17.0))
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 14.0
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
-
-        # Phase 5: Oscillation down — T=1030, would increase, but blocked (5 s from T=1025)
-        mock_time = 1030.0
-        hass.states.async_set(POWER_METER, meter_for_available(24.0, 14.0))
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 14.0
-        assert hass.states.get(state_id).state == STATE_RAMP_UP_HOLD
-
-        # Phase 6: Load stays low for 31 s from last reduction (T=1025+31=T=1056) → allowed
-        mock_time = 1056.0
-        hass.states.async_set(POWER_METER, meter_for_available(24.01, 14.0))
-        await hass.async_block_till_done()
-
-        final = float(hass.states.get(current_set_id).state)
-        assert final > 14.0
-        assert hass.states.get(state_id).state == STATE_ADJUSTING
+        assert h.current_set() > 14.0
 
     async def test_oscillation_never_stops_if_always_above_min_ev(
-        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry
+        self, hass: HomeAssistant, mock_config_entry: MockConfigEntry, freezer: FrozenDateTimeFactory
     ) -> None:
         """Oscillating load that always stays above min_ev never stops the charger."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 30.0
-
-        mock_time = 1000.0
-
-        def fake_monotonic():
-            return mock_time
-
-        coordinator._time_fn = fake_monotonic
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
+        h = await setup_charging_harness(hass, mock_config_entry)
+        h.coordinator.ramp_up_time_s = 30.0
 
         # Start at 18 A (no prior reduction)
-        hass.states.async_set(POWER_METER, "3000")
-        await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        await _push_meter(h, "3000", "start", current_set=18.0)
 
         # Oscillate: available drops to 8 A → 20 A → 6 A → 15 A
         # Each step keeps current ≥ min_ev (6 A) → charger always on
-        for mock_time, available in [
-            (1010.0, 8.0),
-            (1015.0, 20.0),
-            (1020.0, 6.0),
-            (1025.0, 15.0),
+        for elapsed_s, available in [
+            (10, 8.0),
+            (5, 20.0),
+            (5, 6.0),
+            (5, 15.0),
         ]:
-            current = float(hass.states.get(current_set_id).state)
-            hass.states.async_set(POWER_METER, meter_for_available(available, current))
-            await hass.async_block_till_done()
-
-            assert hass.states.get(active_id).state == "on", (
-                f"Charger stopped at available={available} A — should stay above min_ev"
-            )
-            assert float(hass.states.get(current_set_id).state) >= 6.0
+            freezer.tick(timedelta(seconds=elapsed_s))
+            watts = meter_for_available(available, h.current_set())
+            # Charger must not stop — it should stay above min_ev
+            await _push_meter(h, watts, f"available={available} A", active="on")
+            assert h.current_set() >= 6.0
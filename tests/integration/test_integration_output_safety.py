@@ -33,8 +33,7 @@ from conftest import (
     SET_CURRENT_SCRIPT,
     STOP_CHARGING_SCRIPT,
     START_CHARGING_SCRIPT,
-    setup_integration,
-    get_entity_id,
+    setup_charging_harness,
 )
 
 
@@ -85,19 +84,14 @@ class TestChargingCurrentExactBoundaries:
     ) -> None:
         """Available current exactly at min EV (6 A) charges at that rate with correct actions."""
         calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
+        h = await setup_charging_harness(hass, mock_config_entry_with_actions, ramp_up_time_s=0.0)
 
         # 5980 W → available = 32 - (5980/230) = 32 - 26 = 6 A = min → charge
         hass.states.async_set(POWER_METER, "5980")
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MIN_EV_CURRENT
-        assert hass.states.get(active_id).state == "on"
+        assert float(hass.states.get(h.ids.current_set).state) == DEFAULT_MIN_EV_CURRENT
+        assert hass.states.get(h.ids.active).state == "on"
 
         # start_charging + set_current should fire
         start_calls = [c for c in calls if c.data["entity_id"] == START_CHARGING_SCRIPT]
@@ -113,17 +107,13 @@ class TestChargingCurrentExactBoundaries:
     ) -> None:
         """Available current one amp above min (7 A) charges normally."""
         async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
+        h = await setup_charging_harness(hass, mock_config_entry_with_actions, ramp_up_time_s=0.0)
 
         # 5750 W → available = 32 - (5750/230) = 32 - 25 = 7 A > min → charge at 7 A
         hass.states.async_set(POWER_METER, "5750")
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 7.0
+        assert float(hass.states.get(h.ids.current_set).state) == 7.0
 
     async def test_available_one_amp_below_min_stops_with_actions(
         self,
@@ -132,19 +122,14 @@ class TestChargingCurrentExactBoundaries:
     ) -> None:
         """Available current one amp below min (5 A) stops charging and fires stop action."""
         async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry_with_actions, "binary_sensor", "active")
+        h = await setup_charging_harness(hass, mock_config_entry_with_actions, ramp_up_time_s=0.0)
 
         # 6210 W → available = 32 - (6210/230) = 32 - 27 = 5 A < min (6 A) → stop
         hass.states.async_set(POWER_METER, "6210")
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        assert float(hass.states.get(h.ids.current_set).state) == 0.0
+        assert hass.states.get(h.ids.active).state == "off"
 
     async def test_available_exactly_at_max_charger_current_caps(
         self,
@@ -153,11 +138,7 @@ class TestChargingCurrentExactBoundaries:
     ) -> None:
         """Available current at exactly charger max (32 A) charges at max."""
         calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, mock_config_entry_with_actions)
-        coordinator = hass.data[DOMAIN][mock_config_entry_with_actions.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry_with_actions, "sensor", "current_set")
+        h = await setup_charging_harness(hass, mock_config_entry_with_actions, ramp_up_time_s=0.0)
 
         # First set a non-zero value, then 0 W to trigger event
         hass.states.async_set(POWER_METER, "1000")
@@ -168,18 +149,14 @@ class TestChargingCurrentExactBoundaries:
         await hass.async_block_till_done()
 
         # available = 32 A → capped at max (32 A)
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MAX_CHARGER_CURRENT
+        assert float(hass.states.get(h.ids.current_set).state) == DEFAULT_MAX_CHARGER_CURRENT
 
     async def test_available_one_above_max_still_caps(
         self, hass: HomeAssistant,
     ) -> None:
         """Available current above charger max is capped — extra headroom is unused."""
         entry = _make_entry(hass, max_service_a=40.0)
-        await setup_integration(hass, entry)
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
+        h = await setup_charging_harness(hass, entry, ramp_up_time_s=0.0)
 
         # First set a non-zero value, then 0 W
         hass.states.async_set(POWER_METER, "1000")
@@ -189,7 +166,7 @@ class TestChargingCurrentExactBoundaries:
         await hass.async_block_till_done()
 
         # available = 40 A > max charger (32 A) → caps at 32 A
-        assert float(hass.states.get(current_set_id).state) == DEFAULT_MAX_CHARGER_CURRENT
+        assert float(hass.states.get(h.ids.current_set).state) == DEFAULT_MAX_CHARGER_CURRENT
 
 
 # ---------------------------------------------------------------------------
@@ -210,27 +187,21 @@ class TestOutputNeverExceedsServiceLimit:
     ) -> None:
         """When charger max (80 A) > service limit (20 A), output never exceeds 20 A."""
         entry = _make_entry(hass, max_service_a=20.0)
-        await setup_integration(hass, entry)
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
+        h = await setup_charging_harness(hass, entry, ramp_up_time_s=0.0)
 
         # Raise charger max to 80 A
-        max_id = get_entity_id(hass, entry, "number", "max_charger_current")
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": MAX_CHARGER_CURRENT},
+            {"entity_id": h.ids.max_charger_current, "value": MAX_CHARGER_CURRENT},
             blocking=True,
         )
-        await hass.async_block_till_done()
-
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
 
         # Low load: 1000 W → available = 20 - 4.35 = 15.65 A
         # Safety clamp ensures output ≤ min(80, 20) = 20 A
         hass.states.async_set(POWER_METER, "1000")
         await hass.async_block_till_done()
 
-        output = float(hass.states.get(current_set_id).state)
+        output = float(hass.states.get(h.ids.current_set).state)
         assert output <= 20.0, f"Output {output} A exceeds service limit 20 A"
         assert output > 0.0, "Charger should be active with low load"
 
@@ -239,20 +210,14 @@ class TestOutputNeverExceedsServiceLimit:
     ) -> None:
         """set_limit to 50 A when service limit is 20 A is clamped to 20 A by safety clamp."""
         entry = _make_entry(hass, max_service_a=20.0)
-        await setup_integration(hass, entry)
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
+        h = await setup_charging_harness(hass, entry, ramp_up_time_s=0.0)
 
         # Raise charger max to 80 A so clamp_current doesn't catch it first
-        max_id = get_entity_id(hass, entry, "number", "max_charger_current")
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": MAX_CHARGER_CURRENT},
+            {"entity_id": h.ids.max_charger_current, "value": MAX_CHARGER_CURRENT},
             blocking=True,
         )
-        await hass.async_block_till_done()
-
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
 
         # Start charging
         hass.states.async_set(POWER_METER, "1000")
@@ -264,7 +229,7 @@ class TestOutputNeverExceedsServiceLimit:
         )
         await hass.async_block_till_done()
 
-        output = float(hass.states.get(current_set_id).state)
+        output = float(hass.states.get(h.ids.current_set).state)
         assert output <= 20.0, f"Output {output} A exceeds service limit 20 A"
         assert output == 20.0
 
@@ -274,25 +239,20 @@ class TestOutputNeverExceedsServiceLimit:
         """The current_a variable sent to action scripts is safety-clamped to service limit."""
         entry = _make_entry(hass, max_service_a=20.0, with_actions=True)
         calls = async_mock_service(hass, "script", "turn_on")
-        await setup_integration(hass, entry)
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
+        h = await setup_charging_harness(hass, entry, ramp_up_time_s=0.0)
 
         # Raise charger max to 80 A
-        max_id = get_entity_id(hass, entry, "number", "max_charger_current")
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": MAX_CHARGER_CURRENT},
+            {"entity_id": h.ids.max_charger_current, "value": MAX_CHARGER_CURRENT},
             blocking=True,
         )
-        await hass.async_block_till_done()
 
         # Start charging at moderate load — output will be at some value ≤ 20 A
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
 
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
-        current_before = float(hass.states.get(current_set_id).state)
+        current_before = float(hass.states.get(h.ids.current_set).state)
         assert current_before > 0.0
         calls.clear()
 
@@ -303,7 +263,7 @@ class TestOutputNeverExceedsServiceLimit:
         )
         await hass.async_block_till_done()
 
-        output = float(hass.states.get(current_set_id).state)
+        output = float(hass.states.get(h.ids.current_set).state)
         assert output <= 20.0, f"Output {output} A exceeds service limit 20 A"
 
         # Verify the action received the safe value
@@ -332,11 +292,7 @@ class TestOutputNeverExceedsServiceLimit:
             },
             title="EV Load Balancing",
         )
-        await setup_integration(hass, entry)
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
+        h = await setup_charging_harness(hass, entry, ramp_up_time_s=0.0)
 
         # Start charging
         hass.states.async_set(POWER_METER, "1000")
@@ -347,7 +303,7 @@ class TestOutputNeverExceedsServiceLimit:
         hass.states.async_set(POWER_METER, "unavailable")
         await hass.async_block_till_done()
 
-        output = float(hass.states.get(current_set_id).state)
+        output = float(hass.states.get(h.ids.current_set).state)
         assert output <= 16.0, f"Fallback {output} A exceeds service limit 16 A"
 
     async def test_output_never_exceeds_charger_max(
@@ -355,26 +311,20 @@ class TestOutputNeverExceedsServiceLimit:
     ) -> None:
         """When service limit (40 A) > charger max (10 A), output is capped at charger max."""
         entry = _make_entry(hass, max_service_a=40.0)
-        await setup_integration(hass, entry)
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
+        h = await setup_charging_harness(hass, entry, ramp_up_time_s=0.0)
 
         # Lower charger max to 10 A
-        max_id = get_entity_id(hass, entry, "number", "max_charger_current")
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": 10.0},
+            {"entity_id": h.ids.max_charger_current, "value": 10.0},
             blocking=True,
         )
-        await hass.async_block_till_done()
-
-        current_set_id = get_entity_id(hass, entry, "sensor", "current_set")
 
         # Very low load: 230 W → available = 40 - 1 = 39 A, capped at 10 A
         hass.states.async_set(POWER_METER, "230")
         await hass.async_block_till_done()
 
-        output = float(hass.states.get(current_set_id).state)
+        output = float(hass.states.get(h.ids.current_set).state)
         assert output <= 10.0, f"Output {output} A exceeds charger max 10 A"
         assert output == 10.0
 
@@ -395,18 +345,13 @@ class TestChargingCurrentNeverExceedsAvailable:
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """Charging current never exceeds available current on the first power meter reading."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        available_id = get_entity_id(hass, mock_config_entry, "sensor", "available_current")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         hass.states.async_set(POWER_METER, "690")
         await hass.async_block_till_done()
 
-        output = float(hass.states.get(current_set_id).state)
-        available = float(hass.states.get(available_id).state)
+        output = float(hass.states.get(h.ids.current_set).state)
+        available = float(hass.states.get(h.ids.available_current).state)
 
         assert output <= available, f"Charging current {output} A exceeds available {available} A"
 
@@ -419,20 +364,15 @@ class TestChargingCurrentNeverExceedsAvailable:
         After EV starts at some current, a new meter event fires.  The charger current
         must still not exceed available.
         """
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        available_id = get_entity_id(hass, mock_config_entry, "sensor", "available_current")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Step 1: 690 W non-EV load; EV is at 0 A.
         # available = 32 - 3 = 29 A → EV set to 29 A.
         hass.states.async_set(POWER_METER, "690")
         await hass.async_block_till_done()
 
-        output_step1 = float(hass.states.get(current_set_id).state)
-        available_step1 = float(hass.states.get(available_id).state)
+        output_step1 = float(hass.states.get(h.ids.current_set).state)
+        available_step1 = float(hass.states.get(h.ids.available_current).state)
         assert output_step1 <= available_step1, (
             f"Step 1: output {output_step1} A exceeds available {available_step1} A"
         )
@@ -440,13 +380,13 @@ class TestChargingCurrentNeverExceedsAvailable:
         # Step 2: meter fires again with the same non-EV load (e.g. meter includes
         # EV and reflects the new EV draw: 690 + 29*230 = 7360 W).
         # With correct algorithm: non_ev = 7360 - 29*230 = 690 W → available = 29 A → stays at 29 A.
-        ev_current = coordinator.current_set_a
+        ev_current = h.coordinator.current_set_a
         meter_with_ev = 690.0 + ev_current * 230.0
         hass.states.async_set(POWER_METER, str(meter_with_ev))
         await hass.async_block_till_done()
 
-        output_step2 = float(hass.states.get(current_set_id).state)
-        available_step2 = float(hass.states.get(available_id).state)
+        output_step2 = float(hass.states.get(h.ids.current_set).state)
+        available_step2 = float(hass.states.get(h.ids.available_current).state)
         assert output_step2 <= available_step2, (
             f"Step 2: output {output_step2} A exceeds available {available_step2} A"
         )
@@ -455,25 +395,20 @@ class TestChargingCurrentNeverExceedsAvailable:
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """Charging current ≤ available current holds across a sequence of power meter events."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        available_id = get_entity_id(hass, mock_config_entry, "sensor", "available_current")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Simulate a series of whole-house meter readings (meter includes EV).
         # Non-EV load fluctuates; EV adapts each cycle.
         non_ev_powers_w = [690.0, 1150.0, 460.0, 4600.0, 230.0]
 
         for non_ev_w in non_ev_powers_w:
-            ev_power_w = coordinator.current_set_a * 230.0
+            ev_power_w = h.coordinator.current_set_a * 230.0
             service_power_w = non_ev_w + ev_power_w
             hass.states.async_set(POWER_METER, str(service_power_w))
             await hass.async_block_till_done()
 
-            output = float(hass.states.get(current_set_id).state)
-            available = float(hass.states.get(available_id).state)
+            output = float(hass.states.get(h.ids.current_set).state)
+            available = float(hass.states.get(h.ids.available_current).state)
             assert output <= available, (
                 f"non_ev={non_ev_w} W: output {output} A exceeds available {available} A"
             )
@@ -486,92 +421,74 @@ class TestPowerMeterSafetyGuardrails:
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """A power meter reading above 200 kW is rejected and state is unchanged."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Start charging at 18 A
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(h.ids.current_set).state) == 18.0
 
         # Reading above safety limit → rejected, state unchanged
         hass.states.async_set(POWER_METER, str(SAFETY_MAX_POWER_METER_W + 1))
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(h.ids.current_set).state) == 18.0
 
     async def test_reading_exactly_at_200kw_is_accepted(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """A power meter reading of exactly 200 kW is accepted (within the limit)."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        active_id = get_entity_id(hass, mock_config_entry, "binary_sensor", "active")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Exactly 200,000 W → accepted, massive overload → stop
         hass.states.async_set(POWER_METER, str(SAFETY_MAX_POWER_METER_W))
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 0.0
-        assert hass.states.get(active_id).state == "off"
+        assert float(hass.states.get(h.ids.current_set).state) == 0.0
+        assert hass.states.get(h.ids.active).state == "off"
 
     async def test_negative_reading_above_200kw_is_rejected(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """A negative power meter reading below -200 kW is rejected as sensor error."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Start charging at 18 A
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(h.ids.current_set).state) == 18.0
 
         # Insane negative reading → rejected
         hass.states.async_set(POWER_METER, str(-(SAFETY_MAX_POWER_METER_W + 1)))
         await hass.async_block_till_done()
 
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(h.ids.current_set).state) == 18.0
 
     async def test_parameter_change_with_insane_meter_is_ignored(
         self, hass: HomeAssistant, mock_config_entry: MockConfigEntry,
     ) -> None:
         """Changing a parameter when the meter shows an insane value doesn't produce unsafe output."""
-        await setup_integration(hass, mock_config_entry)
-        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
-        coordinator.ramp_up_time_s = 0.0
-
-        current_set_id = get_entity_id(hass, mock_config_entry, "sensor", "current_set")
-        max_id = get_entity_id(hass, mock_config_entry, "number", "max_charger_current")
+        h = await setup_charging_harness(hass, mock_config_entry, ramp_up_time_s=0.0)
 
         # Start charging at 18 A
         hass.states.async_set(POWER_METER, "3000")
         await hass.async_block_till_done()
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(h.ids.current_set).state) == 18.0
 
         # Set meter to insane value (simulating sensor glitch)
         hass.states.async_set(POWER_METER, "500000")
         await hass.async_block_till_done()
 
         # State unchanged because reading was rejected
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(h.ids.current_set).state) == 18.0
 
         # Now change a parameter — recompute should also skip insane meter value
         await hass.services.async_call(
             "number", "set_value",
-            {"entity_id": max_id, "value": 20.0},
+            {"entity_id": h.ids.max_charger_current, "value": 20.0},
             blocking=True,
         )
         await hass.async_block_till_done()
 
         # Output should still be 18 A (not recomputed with insane meter)
-        assert float(hass.states.get(current_set_id).state) == 18.0
+        assert float(hass.states.get(h.ids.current_set).state) == 18.0
@@ -10,7 +10,7 @@ Tests cover:
 
 from unittest.mock import patch
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceRegistry
 from homeassistant.exceptions import HomeAssistantError
 
 from pytest_homeassistant_custom_component.common import (
@@ -53,8 +53,8 @@ class TestRetryBackoff:
         coordinator = no_sleep_coordinator(hass, mock_config_entry_with_actions)
         events = collect_events(hass, EVENT_ACTION_FAILED)
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -78,8 +78,8 @@ class TestRetryBackoff:
         await setup_integration(hass, mock_config_entry_with_actions)
         coordinator = no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -90,10 +90,8 @@ class TestRetryBackoff:
         # Each failing action produces retries: delays 1.0, 2.0, 4.0
         # start_charging fails (3 retries) then set_current fails (3 retries)
         expected_pattern = [1.0, 2.0, 4.0]
-        # Each failed action should produce the same backoff pattern
-        for i in range(0, len(sleep_calls), ACTION_MAX_RETRIES):
-            chunk = sleep_calls[i : i + ACTION_MAX_RETRIES]
-            assert chunk == expected_pattern
+        # Each failed action should produce the same backoff pattern, back to back
+        assert sleep_calls == expected_pattern * (len(sleep_calls) // ACTION_MAX_RETRIES)
 
     async def test_successful_retry_after_initial_failure(
         self,
@@ -114,8 +112,8 @@ class TestRetryBackoff:
             if call_count % 2 == 1:
                 raise HomeAssistantError("Transient error")
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=flaky_call,
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -144,8 +142,8 @@ class TestRetryBackoff:
             call_count += 1
             raise HomeAssistantError("Always fails")
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=counting_call,
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -196,8 +194,8 @@ class TestStaleRetryCancellation:
             service_call_count += 1
             raise HomeAssistantError("Failing")
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=always_fail,
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -233,8 +231,8 @@ class TestSuccessClearsError:
         coordinator = no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
         # Step 1: Cause a failure
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -260,8 +258,8 @@ class TestSuccessClearsError:
         no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
         # Step 1: Cause a failure to create the notification
-        with patch(PN_CREATE), patch(PN_DISMISS), patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch(PN_CREATE), patch(PN_DISMISS), patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -328,8 +326,8 @@ class TestDiagnosticSensors:
         await setup_integration(hass, mock_config_entry_with_actions)
         no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -406,8 +404,8 @@ class TestDiagnosticSensors:
         await setup_integration(hass, mock_config_entry_with_actions)
         no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -499,8 +497,8 @@ class TestDiagnosticSensors:
         await setup_integration(hass, mock_config_entry_with_actions)
         no_sleep_coordinator(hass, mock_config_entry_with_actions)
 
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             hass.states.async_set(POWER_METER, "3000")
@@ -12,7 +12,7 @@ Tests cover:
 
 from unittest.mock import patch
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceRegistry
 from homeassistant.exceptions import HomeAssistantError
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
@@ -405,8 +405,8 @@ class TestActionFailedEvent:
         events = collect_events(hass, EVENT_ACTION_FAILED)
 
         # Make the script service call raise an error
-        with patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             # Trigger a state change that would fire actions (0→active)
@@ -423,8 +423,8 @@ class TestActionFailedEvent:
         self, hass: HomeAssistant, mock_config_entry_with_actions: MockConfigEntry
     ) -> None:
         """A persistent notification warns the user when a charger action script fails."""
-        with patch(PN_CREATE) as mock_create, patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch(PN_CREATE) as mock_create, patch.object(
+            ServiceRegistry, "async_call",
             side_effect=HomeAssistantError("Script not found"),
         ):
             await setup_integration(hass, mock_config_entry_with_actions)
@@ -442,8 +442,8 @@ class TestActionFailedEvent:
     ) -> None:
         """A persistent notification is shown on the dashboard even when the charger script
         fails with an unrecognised error type."""
-        with patch(PN_CREATE) as mock_create, patch(
-            "homeassistant.core.ServiceRegistry.async_call",
+        with patch(PN_CREATE) as mock_create, patch.object(
+            ServiceRegistry, "async_call",
             side_effect=RuntimeError("Unexpected failure"),
         ):
             await setup_integration(hass, mock_config_entry_with_actions)